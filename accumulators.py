@@ -0,0 +1,317 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+from ranks import midranks, tie_term
+
+# Mergeable accumulators behind the ANOVA and Kruskal-Wallis tests.
+#
+# Both are small pandas objects indexed by cell (category, or tuple of categories), so
+# shards of the data processed by different workers, chunks or days can be combined in
+# any order into exactly the statistics of the concatenated rows:
+# - moments: count, mean and M2 (sum of squared deviations from the mean) per cell,
+#   merged with Chan et al.'s parallel update
+# - histogram: number of rows per (cell, value); the Acceptance_Score only takes a few
+#   dozen distinct values on its 0-100 scale (mean of four 1-7 ratings), so the histogram
+#   gives exact ranks, medians and quartiles
+
+
+# count, mean and M2 of a variable per cell of one or more categorical variables
+def cell_moments(df, by, target_variable):
+    grouped = df.groupby(by, observed=True)[target_variable]
+    moments = grouped.agg(count="count", mean="mean")
+    moments["m2"] = grouped.var(ddof=0).fillna(0.0) * moments["count"]
+    return moments[moments["count"] > 0]
+
+
+# Combine two moment accumulators
+def merge_moments(a, b):
+    """
+    Merges two count/mean/M2 accumulators indexed by cell into one (Chan et al.).
+    """
+    a, b = a.align(b, fill_value=0)
+    count = a["count"] + b["count"]
+    delta = b["mean"] - a["mean"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = a["mean"] + delta * (b["count"] / count)
+        m2 = a["m2"] + b["m2"] + delta ** 2 * (a["count"] * b["count"] / count)
+    merged = pd.DataFrame({"count": count.astype(int), "mean": mean, "m2": m2})
+    return merged[merged["count"] > 0].sort_index()
+
+
+# number of rows per (cell, value)
+def value_histogram(df, by, target_variable):
+    by = [by] if isinstance(by, str) else list(by)
+    return df.groupby(by + [target_variable], observed=True).size()
+
+
+# Combine two histogram accumulators
+def merge_histograms(a, b):
+    return a.add(b, fill_value=0).astype(int).sort_index()
+
+
+# F-test of a one-way ANOVA from per-group count, sum and sum of squares
+def anova_f_from_aggregates(counts, sums, sums_sq):
+    """
+    Computes the one-way ANOVA F-test from per-group sufficient statistics.
+
+    Uses O(groups) memory; no design matrix is built. For numerical stability the
+    aggregates should be taken on values centred near the grand mean.
+
+    Parameters:
+    - counts (array): Number of observations per group.
+    - sums (array): Sum of the values per group.
+    - sums_sq (array): Sum of the squared values per group.
+
+    Returns:
+    - dict: sum_sq_between, sum_sq_within, df_between, df_within, F and p_value.
+    """
+    counts = np.asarray(counts, dtype=float)
+    sums = np.asarray(sums, dtype=float)
+    sums_sq = np.asarray(sums_sq, dtype=float)
+    nonempty = counts > 0
+    counts, sums, sums_sq = counts[nonempty], sums[nonempty], sums_sq[nonempty]
+
+    n_total = counts.sum()
+    df_between = len(counts) - 1
+    df_within = n_total - len(counts)
+
+    grand_sum = sums.sum()
+    sum_sq_total = sums_sq.sum() - grand_sum ** 2 / n_total if n_total else np.nan
+    sum_sq_between = (sums ** 2 / counts).sum() - grand_sum ** 2 / n_total if n_total else np.nan
+    sum_sq_within = max(sum_sq_total - sum_sq_between, 0.0)
+
+    if df_between < 1 or df_within < 1:
+        f_stat, p_value = np.nan, np.nan
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f_stat = (sum_sq_between / df_between) / (sum_sq_within / df_within)
+        p_value = stats.f.sf(f_stat, df_between, df_within)
+
+    return {
+        "sum_sq_between": sum_sq_between,
+        "sum_sq_within": sum_sq_within,
+        "df_between": df_between,
+        "df_within": df_within,
+        "F": f_stat,
+        "p_value": p_value,
+    }
+
+
+# One-way ANOVA from a moment accumulator
+def one_way_anova_from_moments(moments):
+    """
+    Computes the one-way ANOVA F-test from per-group count / mean / M2.
+
+    Returns:
+    - dict: sum_sq_between, sum_sq_within, df_between, df_within, F and p_value.
+    """
+    counts = moments["count"].to_numpy(dtype=float)
+    offsets = moments["mean"].to_numpy() - np.average(moments["mean"], weights=counts)
+    # centred sums: sum = n * (mean - grand mean), sum of squares = M2 + n * (mean - grand mean)^2
+    return anova_f_from_aggregates(counts, counts * offsets, moments["m2"].to_numpy() + counts * offsets ** 2)
+
+
+def _weighted_rss(design, means, weights):
+    # weighted least squares of the cell means; with the within-cell M2 this is the row-level RSS
+    sqrt_weights = np.sqrt(weights)
+    x = design * sqrt_weights[:, None]
+    y = means * sqrt_weights
+    coef, _, rank, _ = np.linalg.lstsq(x, y, rcond=None)
+    return float(((y - x @ coef) ** 2).sum()), rank
+
+
+def _dummies(codes, n_levels):
+    # treatment coding, first level as reference
+    return np.eye(n_levels)[codes][:, 1:]
+
+
+# Two-way ANOVA (Type II) from a moment accumulator over two factors
+def two_way_anova_from_moments(moments):
+    """
+    Computes the Type II two-way ANOVA table (main effects and interaction) from
+    per-cell count / mean / M2, indexed by a (factor 1, factor 2) MultiIndex.
+
+    Each sum of squares is the drop in residual sum of squares between nested models
+    fitted to the cell means weighted by cell size, which equals an OLS fit on the rows.
+
+    Returns:
+    - DataFrame: Rows factor 1, factor 2, "factor 1:factor 2" and "Residual" with
+      sum_sq, df, F and PR(>F), like statsmodels' anova_lm(typ=2).
+    """
+    first, second = moments.index.names
+    codes_a, levels_a = pd.factorize(moments.index.get_level_values(0), sort=True)
+    codes_b, levels_b = pd.factorize(moments.index.get_level_values(1), sort=True)
+    counts = moments["count"].to_numpy(dtype=float)
+    means = moments["mean"].to_numpy() - np.average(moments["mean"], weights=counts)
+
+    intercept = np.ones((len(moments), 1))
+    dummies_a = _dummies(codes_a, len(levels_a))
+    dummies_b = _dummies(codes_b, len(levels_b))
+    rss_a, rank_a = _weighted_rss(np.hstack([intercept, dummies_a]), means, counts)
+    rss_b, rank_b = _weighted_rss(np.hstack([intercept, dummies_b]), means, counts)
+    rss_ab, rank_ab = _weighted_rss(np.hstack([intercept, dummies_a, dummies_b]), means, counts)
+
+    sum_sq_resid = float(moments["m2"].sum())
+    df_resid = counts.sum() - len(moments)
+    table = pd.DataFrame(
+        {
+            "sum_sq": [rss_b - rss_ab, rss_a - rss_ab, rss_ab, sum_sq_resid],
+            "df": [float(rank_ab - rank_b), float(rank_ab - rank_a), float(len(moments) - rank_ab), float(df_resid)],
+        },
+        index=[first, second, f"{first}:{second}", "Residual"],
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table["F"] = (table["sum_sq"] / table["df"]) / (sum_sq_resid / df_resid)
+    table["PR(>F)"] = stats.f.sf(table["F"], table["df"], df_resid)
+    table.loc["Residual", ["F", "PR(>F)"]] = np.nan
+    return table
+
+
+# Kruskal-Wallis H test from a histogram accumulator over one factor
+def kruskal_from_histogram(histogram):
+    """
+    Computes the Kruskal-Wallis H statistic (tie corrected) and its chi-squared p-value
+    from the number of rows per (group, value). Tied values share their average rank.
+
+    Returns:
+    - tuple: (H statistic, p-value)
+    """
+    counts = histogram.unstack(fill_value=0).sort_index(axis=1)
+    ties = counts.sum(axis=0).to_numpy(dtype=float)
+    n_total = ties.sum()
+    rank_sums = counts.to_numpy(dtype=float) @ midranks(ties)
+    group_sizes = counts.sum(axis=1).to_numpy(dtype=float)
+
+    h_stat = 12 / (n_total * (n_total + 1)) * (rank_sums ** 2 / group_sizes).sum() - 3 * (n_total + 1)
+    h_stat /= 1 - tie_term(ties) / (n_total ** 3 - n_total)
+    return h_stat, stats.chi2.sf(h_stat, len(group_sizes) - 1)
+
+
+# Mann-Whitney U test from a histogram accumulator over a two-level factor
+def mann_whitney_from_histogram(histogram, first=None):
+    """
+    Computes the two-sided Mann-Whitney U test with the normal approximation (tie and
+    continuity corrected, as scipy.stats.mannwhitneyu's asymptotic method) from the
+    number of rows per (group, value).
+
+    Parameters:
+    - histogram (Series): Rows per (group, value) of exactly two groups.
+    - first (str): Group whose U statistic is returned; the first in sorted order if None.
+
+    Returns:
+    - tuple: (U statistic of the first group, p-value)
+    """
+    counts = histogram.unstack(fill_value=0).sort_index(axis=1)
+    if first is not None:
+        counts = counts.loc[[first] + [g for g in counts.index if g != first]]
+    ties = counts.sum(axis=0).to_numpy(dtype=float)
+    n1, n2 = counts.sum(axis=1).to_numpy(dtype=float)
+    n_total = n1 + n2
+
+    u1 = float(counts.iloc[0].to_numpy(dtype=float) @ midranks(ties)) - n1 * (n1 + 1) / 2
+    u_max = max(u1, n1 * n2 - u1)
+    sigma = np.sqrt(n1 * n2 / 12 * ((n_total + 1) - tie_term(ties) / (n_total * (n_total - 1))))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (u_max - n1 * n2 / 2 - 0.5) / sigma
+    return u1, float(np.clip(2 * stats.norm.sf(z), 0, 1))
+
+
+# count, mean vector and co-moment matrix of several items (rows with a missing item are left out)
+def item_moments(df, columns):
+    items = df[list(columns)].dropna().to_numpy(dtype=float)
+    mean = items.mean(axis=0) if len(items) else np.zeros(len(columns))
+    centred = items - mean
+    return {"columns": list(columns), "count": len(items), "mean": mean, "comoment": centred.T @ centred}
+
+
+# Combine two item moment accumulators
+def merge_item_moments(a, b):
+    """
+    Merges two count / mean vector / co-moment accumulators of the same items
+    (multivariate form of Chan et al.'s update). Counts may be arrays with one entry per
+    bootstrap replicate (see reliability.py), the means and co-moments then carry the same
+    leading axis.
+    """
+    if a["columns"] != b["columns"]:
+        raise ValueError(f"❌ Cannot merge item moments of {a['columns']} and {b['columns']}.")
+    count = a["count"] + b["count"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = np.where(count > 0, np.divide(b["count"], count), 0.0)
+    delta = b["mean"] - a["mean"]
+    mean = a["mean"] + delta * np.asarray(share)[..., None]
+    weight = np.asarray(a["count"] * share)[..., None, None]
+    comoment = a["comoment"] + b["comoment"] + delta[..., :, None] * delta[..., None, :] * weight
+    return {"columns": a["columns"], "count": count, "mean": mean, "comoment": comoment}
+
+
+def _item_variances(moments):
+    # item variances, total score variance and covariance row sums (NaN below two rows)
+    count = np.asarray(moments["count"], dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = moments["comoment"] / np.where(count < 2, np.nan, count - 1)[..., None, None]
+    return np.diagonal(covariance, axis1=-2, axis2=-1), covariance.sum(axis=(-2, -1)), covariance.sum(axis=-1)
+
+
+# Cronbach's alpha from an item moment accumulator
+def cronbach_alpha_from_moments(moments):
+    """
+    Computes Cronbach's alpha, k / (k - 1) * (1 - sum of item variances / variance of the
+    total score), from the item covariance matrix.
+
+    Returns:
+    - float: Cronbach's alpha (NaN for fewer than two complete rows), or an array of
+      alphas for replicate accumulators.
+    """
+    k = len(moments["columns"])
+    variances, total, _ = _item_variances(moments)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        alpha = k / (k - 1) * (1 - variances.sum(axis=-1) / total)
+    return alpha if alpha.ndim else float(alpha)
+
+
+# Cronbach's alpha of the scale without each item
+def alpha_if_deleted_from_moments(moments):
+    """
+    Computes Cronbach's alpha of the remaining k - 1 items for every item left out, all
+    from the one covariance matrix: dropping item i removes its variance from the trace
+    and its row and column from the total variance.
+
+    Returns:
+    - array: Alpha without each item, in the order of moments["columns"] (last axis when the
+      accumulator has replicates). NaN with fewer than three items.
+    """
+    k = len(moments["columns"])
+    variances, total, row_sums = _item_variances(moments)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        remaining_total = total[..., None] - 2 * row_sums + variances
+        remaining_trace = variances.sum(axis=-1)[..., None] - variances
+        return (k - 1) / (k - 2) * (1 - remaining_trace / remaining_total) if k > 2 else np.full(variances.shape, np.nan)
+
+
+# Normality test of all values of a histogram accumulator
+def normality_from_histogram(histogram):
+    """
+    Tests normality of the values counted in a histogram (summed over its cells), with the
+    rules of utils.check_normality: Shapiro-Wilk below 50 values, otherwise a
+    Kolmogorov-Smirnov test against a normal with the sample mean and SD. The KS
+    statistic is read off the empirical CDF at the distinct values, so it equals
+    scipy.stats.kstest on the raw values without expanding them.
+
+    Returns:
+    - tuple: (test name, p-value)
+    """
+    counts = histogram.groupby(level=-1).sum().sort_index()
+    values = counts.index.to_numpy(dtype=float)
+    counts = counts.to_numpy(dtype=float)
+    n_total = counts.sum()
+    if n_total < 50:
+        return "Shapiro-Wilk", float(stats.shapiro(np.repeat(values, counts.astype(int))).pvalue)
+
+    mean = (values * counts).sum() / n_total
+    std = np.sqrt((counts * (values - mean) ** 2).sum() / (n_total - 1))
+    cdf = stats.norm.cdf(values, mean, std)
+    cumulative = np.cumsum(counts)
+    # largest gap above the normal CDF at the last tied value, below it at the first one
+    d_stat = max((cumulative / n_total - cdf).max(), (cdf - (cumulative - counts) / n_total).max())
+    return "Kolmogorov-Smirnov", float(np.clip(stats.kstwo.sf(d_stat, int(n_total)), 0, 1))
@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+# statistics the bootstrap engine computes per group
+STATISTICS = ("mean", "median")
+
+# resamples drawn per batch at most
+CHUNK_SIZE = 2000
+
+# element budget of the index matrix of one batch; large samples get fewer resamples per
+# batch, so memory stays bounded however many observations there are
+MAX_BATCH_ELEMENTS = 4_000_000
+
+
+def _grouped_values(df, by, target_variable):
+    # values laid out group after group, so every group is one contiguous column segment
+    by = [by] if isinstance(by, str) else list(by)
+    data = df[by + [target_variable]].dropna()
+    grouped = data.groupby(by, sort=True, observed=True)
+    codes, groups = grouped.ngroup().to_numpy(), grouped.size().index
+    order = np.argsort(codes, kind="stable")
+    values = data[target_variable].to_numpy(dtype=float)[order]
+    counts = np.bincount(codes, minlength=len(groups))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return values, starts, counts, groups
+
+
+def _segment_statistic(samples, starts, counts, statistic):
+    # statistic of every group segment for each row of a (rows, n) matrix
+    if statistic == "mean":
+        return np.add.reduceat(samples, starts, axis=1) / counts
+    return np.column_stack([np.median(samples[:, s:s + n], axis=1) for s, n in zip(starts, counts)])
+
+
+def _bootstrap_distribution(values, starts, counts, statistic, n_resamples, rng, chunk_size):
+    """
+    Resamples every group with replacement, all groups at once.
+
+    Each batch draws one integer index matrix whose column j picks a random position
+    inside the segment of the group that column j belongs to. A batch has at most
+    chunk_size rows and MAX_BATCH_ELEMENTS entries (but always at least one row).
+
+    Returns:
+    - array: (n_resamples, groups) bootstrap replicates of the statistic.
+    """
+    segment_start = np.repeat(starts, counts)
+    segment_size = np.repeat(counts, counts)
+    batch_rows = max(1, min(chunk_size, MAX_BATCH_ELEMENTS // max(len(values), 1)))
+    replicates = []
+    for offset in range(0, n_resamples, batch_rows):
+        rows = min(batch_rows, n_resamples - offset)
+        index = segment_start + rng.integers(0, segment_size, size=(rows, len(values)))
+        replicates.append(_segment_statistic(values[index], starts, counts, statistic))
+    return np.vstack(replicates)
+
+
+def _jackknife(values, statistic):
+    # leave-one-out estimates of the statistic, in closed form for mean and median
+    n = len(values)
+    if n < 2:
+        return np.full(n, np.nan)
+    if statistic == "mean":
+        return (values.sum() - values) / (n - 1)
+    ordered = np.sort(values)
+    position = np.argsort(np.argsort(values, kind="stable"), kind="stable")
+    # element k of the sample without the i-th smallest value
+    low, high = (n - 2) // 2, (n - 1) // 2
+    pick_low = np.where(low < position, ordered[low], ordered[low + 1])
+    pick_high = np.where(high < position, ordered[high], ordered[high + 1])
+    return (pick_low + pick_high) / 2
+
+
+def _acceleration(jackknife_samples):
+    # BCa acceleration from the jackknife values of one or more independent samples
+    deviations = [j.mean() - j for j in jackknife_samples if len(j) > 1]
+    numerator = sum((d ** 3).sum() for d in deviations)
+    denominator = 6 * sum((d ** 2).sum() for d in deviations) ** 1.5
+    return numerator / denominator if denominator > 0 else 0.0
+
+
+def _column_quantiles(replicates, levels):
+    # linear interpolated quantile of every column at its own (low, high) levels
+    ordered = np.sort(replicates, axis=0)
+    position = np.clip(levels, 0, 1) * (len(ordered) - 1)
+    below = np.floor(position).astype(int)
+    above = np.minimum(below + 1, len(ordered) - 1)
+    fraction = position - below
+    columns = np.arange(ordered.shape[1])
+    return ordered[below, columns] * (1 - fraction) + ordered[above, columns] * fraction
+
+
+# Percentile or BCa limits of several statistics from their bootstrap replicates
+def confidence_limits(replicates, estimates, accelerations=None, method="percentile", confidence=0.95):
+    """
+    Parameters:
+    - replicates (array): Bootstrap replicates, one row per resample and one column per statistic.
+    - estimates (array): Point estimate of every statistic.
+    - accelerations (array): Jackknife acceleration of every statistic (only used by "bca").
+    - method (str): "percentile" or "bca".
+    - confidence (float): Confidence level of the intervals.
+
+    Returns:
+    - tuple: Arrays of the lower and upper limits.
+    """
+    if accelerations is None:
+        accelerations = np.zeros(replicates.shape[1])
+    alpha = (1 - confidence) / 2
+    levels = np.tile([[alpha], [1 - alpha]], (1, replicates.shape[1]))
+    if method == "bca":
+        # bias correction from the share of replicates below the estimate (ties count half)
+        below = (replicates < estimates).mean(axis=0) + (replicates == estimates).mean(axis=0) / 2
+        z0 = stats.norm.ppf(below)
+        z = stats.norm.ppf([[alpha], [1 - alpha]])
+        levels = stats.norm.cdf(z0 + (z0 + z) / (1 - accelerations * (z0 + z)))
+    elif method != "percentile":
+        raise ValueError(f"❌ Unknown bootstrap CI method '{method}', expected 'percentile' or 'bca'.")
+    return _column_quantiles(replicates, levels)
+
+
+# Bootstrap confidence intervals of a statistic per category
+def bootstrap_group_ci(df, by, target_variable, statistic="mean", method="bca", confidence=0.95,
+                       n_resamples=10000, seed=None, chunk_size=CHUNK_SIZE):
+    """
+    Computes bootstrap confidence intervals of the mean or median of every category.
+
+    Parameters:
+    - df (DataFrame): The dataset (original or perceived).
+    - by (str or list): The categorical variable (e.g., "age group"), or several for their combinations.
+    - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+    - statistic (str): "mean" or "median".
+    - method (str): "bca" (bias-corrected and accelerated) or "percentile".
+    - confidence (float): Confidence level of the intervals.
+    - n_resamples (int): Bootstrap resamples.
+    - seed (int or Generator): Seed or NumPy random generator.
+    - chunk_size (int): Resamples drawn per batch at most (see MAX_BATCH_ELEMENTS).
+
+    Returns:
+    - DataFrame: Indexed by category (MultiIndex for several variables) with n, estimate, ci_low and ci_high.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"❌ Unknown bootstrap statistic '{statistic}', expected one of {STATISTICS}.")
+
+    values, starts, counts, groups = _grouped_values(df, by, target_variable)
+    rng = np.random.default_rng(seed)
+    estimates = _segment_statistic(values[None, :], starts, counts, statistic)[0]
+    replicates = _bootstrap_distribution(values, starts, counts, statistic, n_resamples, rng, chunk_size)
+
+    accelerations = np.zeros(len(groups))
+    if method == "bca":
+        accelerations = np.array([_acceleration([_jackknife(values[s:s + n], statistic)])
+                                  for s, n in zip(starts, counts)])
+    ci_low, ci_high = confidence_limits(replicates, estimates, accelerations, method, confidence)
+
+    return pd.DataFrame({"n": counts, "estimate": estimates, "ci_low": ci_low, "ci_high": ci_high}, index=groups)
+
+
+# Bootstrap confidence intervals of the difference of every category to a reference category
+def bootstrap_difference_ci(df, by, target_variable, reference=None, statistic="mean", method="bca",
+                            confidence=0.95, n_resamples=10000, seed=None, chunk_size=CHUNK_SIZE):
+    """
+    Computes bootstrap confidence intervals of the difference in mean or median between
+    every category and a reference category (category - reference).
+
+    Parameters:
+    - df (DataFrame): The dataset (original or perceived).
+    - by (str): The categorical variable (e.g., "Gender").
+    - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+    - reference (str): Reference category; defaults to the first one in sorted order.
+    - statistic (str): "mean" or "median".
+    - method (str): "bca" (bias-corrected and accelerated) or "percentile".
+    - confidence (float): Confidence level of the intervals.
+    - n_resamples (int): Bootstrap resamples.
+    - seed (int or Generator): Seed or NumPy random generator.
+    - chunk_size (int): Resamples drawn per batch at most (see MAX_BATCH_ELEMENTS).
+
+    Returns:
+    - DataFrame: Indexed by category (reference excluded) with difference, ci_low and ci_high.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"❌ Unknown bootstrap statistic '{statistic}', expected one of {STATISTICS}.")
+
+    values, starts, counts, groups = _grouped_values(df, by, target_variable)
+    if reference is None:
+        reference = groups[0]
+    if reference not in groups:
+        raise KeyError(f"❌ Reference category '{reference}' not found in '{by}'!")
+    ref = groups.get_loc(reference)
+    others = [g for g in range(len(groups)) if g != ref]
+
+    # groups are resampled independently, so each replicate row gives every difference at once
+    rng = np.random.default_rng(seed)
+    estimates = _segment_statistic(values[None, :], starts, counts, statistic)[0]
+    replicates = _bootstrap_distribution(values, starts, counts, statistic, n_resamples, rng, chunk_size)
+    differences = estimates[others] - estimates[ref]
+    replicate_differences = replicates[:, others] - replicates[:, [ref]]
+
+    accelerations = np.zeros(len(others))
+    if method == "bca":
+        jackknives = [_jackknife(values[s:s + n], statistic) for s, n in zip(starts, counts)]
+        accelerations = np.array([_acceleration([jackknives[g], -jackknives[ref]]) for g in others])
+    ci_low, ci_high = confidence_limits(replicate_differences, differences, accelerations, method, confidence)
+
+    return pd.DataFrame({"difference": differences, "ci_low": ci_low, "ci_high": ci_high}, index=groups[others])
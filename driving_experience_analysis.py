@@ -2,7 +2,8 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-from utils import load_data, check_reliability, check_normality,calculate_acceptance_score, save_updated_data, compare_mean_median, check_normality_on_filtered_data
+from utils import prepare_data, check_normality, save_updated_data, compare_mean_median, describe_groups, check_normality_on_filtered_data
+from plotting import submit_plot
 from parametric_tests import one_way_anova
 from non_parametric_tests import kruskal_wallis
 from scipy.stats import mannwhitneyu, ttest_ind
@@ -12,69 +13,7 @@ target_variable = "Acceptance_Score"
 categorical_variable = "Driving experience in years"
 
 
-# Step 1 - load Original & Perceived Data
-df_original, df_perceived = load_data("data sheet.xlsx")
-
-# Ensure all column names are stripped of spaces
-df_original.columns = df_original.columns.str.strip()
-df_perceived.columns = df_perceived.columns.str.strip()
-
-# Step 2 - Perform Cronbach's Alpha (Reliability Test) on both datasets
-alpha_original = check_reliability(df_original)
-if alpha_original > 0.7:
-    print(f"✅ Cronbach's Alpha for Original Data: {alpha_original:.3f} (accepted, alpha > 0.7)")
-else:
-    print(f"❌ Cronbach's Alpha for Original Data: {alpha_original:.3f} (rejected, alpha < 0.7)")
-
-alpha_perceived = check_reliability(df_perceived)
-if alpha_perceived > 0.7:
-    print(f"✅ Cronbach's Alpha for Perceived Data: {alpha_perceived:.3f} (accepted, alpha > 0.7)")
-else:
-    print(f"❌ Cronbach's Alpha for Perceived Data: {alpha_perceived:.3f} (rejected, alpha < 0.7)")
-
-
-# Step 3 - calculate the acceptance score 
-df_original = calculate_acceptance_score(df_original, "Original")
-df_perceived = calculate_acceptance_score(df_perceived, "Perceived")
-
-# after calculation of acceptance for both datasets save e, eou and acceptance in the excel
-
-save_updated_data(df_original, df_perceived)
-
-# Print column names to check if "Age" exists
-# print("\nOriginal Data Columns:", df_original.columns.tolist())
-# print("\nPerceived Data Columns:", df_perceived.columns.tolist())
-
-# Step 4 : Check normality
-is_normal_original = check_normality(df_original, target_variable, "Original")
-is_normal_perceived = check_normality(df_perceived, target_variable, "Perceived")
-
-# step 5: performing the statiscal test 
-
-p_values = {}
-
-if is_normal_original:
-    p_values["one-way anova (Original)"] =  one_way_anova(df_original, categorical_variable,target_variable, "Original")
-else:
-    p_values["Krushal Wills (Original)"] = kruskal_wallis(df_original, categorical_variable, target_variable, "Original")
-
-if is_normal_perceived:
-    p_values["one-way anova (Perceived)"] = one_way_anova(df_perceived,categorical_variable,  target_variable, "Perceived")
-else:
-    p_values["Krushal Wills (Perceived)"] = kruskal_wallis(df_perceived, categorical_variable,  target_variable, "Perceived")
-
-print("\n📊 **P-Value Results Summary:**")
-for test, p_val in p_values.items():
-    print(f"{test}: p = {p_val:.5f} {'✅ Significant' if p_val < 0.10 else '❌ Not Significant'}")
-
-significant_original = any(p < 0.10 for key, p in p_values.items() if "Original" in key)
-significant_perceived = any(p < 0.10 for key, p in p_values.items() if "Perceived" in key)
-
-mean_median_original = compare_mean_median(df_original, categorical_variable, target_variable, "Original")
-mean_median_perceived = compare_mean_median(df_perceived, categorical_variable, target_variable, "Perceived")
-
-
-def plot_driving_experience(df, categorical_var, target_variable, dataset_name, experience_groups_display_map):
+def draw_driving_experience(summary_stats, target_variable, dataset_name, experience_groups_display_map):
     """
     Plots Mean & Median in a bar chart with error bars for Driving Experience groups.
     - Mean → Error bars using Standard Error (SE).
@@ -83,22 +22,6 @@ def plot_driving_experience(df, categorical_var, target_variable, dataset_name,
     - Separate plots for Original & Perceived Data.
     - Ensures missing categories are handled correctly.
     """
-    # Compute Mean, SE, Median, and IQR
-    summary_stats = df.groupby(categorical_var)[target_variable].agg(
-        mean="mean",
-        std="std",
-        count="count",
-        median="median",
-        q1=lambda x: np.percentile(x, 25),
-        q3=lambda x: np.percentile(x, 75)
-    )
-
-    # Compute Standard Error (SE) for Mean
-    summary_stats["se"] = summary_stats["std"] / np.sqrt(summary_stats["count"])
-
-    # Compute IQR (Interquartile Range) for Median
-    summary_stats["iqr"] = summary_stats["q3"] - summary_stats["q1"]
-
     # Rename driving experience labels for consistency
     summary_stats = summary_stats.rename(index=experience_groups_display_map)
 
@@ -177,72 +100,147 @@ def plot_driving_experience(df, categorical_var, target_variable, dataset_name,
     legend2 = ax.legend(title="Statistical Measure", loc="upper left", bbox_to_anchor=(1, 0.8))
     ax.add_artist(legend1)
 
-    # Save plot
-    plt.savefig(f"plot/{dataset_name.lower()}_driving_experience_error_plot.png")
-    print(f"\n✅ Plot saved as 'plot/{dataset_name.lower()}_driving_experience_error_plot.png'")
+    return fig
+
+
+def plot_driving_experience(df, categorical_var, target_variable, dataset_name, experience_groups_display_map):
+    """
+    Computes the summary table and submits the plot drawn by draw_driving_experience.
+    """
+    summary_stats = describe_groups(df, categorical_var, target_variable)
+    submit_plot(draw_driving_experience, f"plot/{dataset_name.lower()}_driving_experience_error_plot.png", summary_stats, target_variable, dataset_name, experience_groups_display_map)
+
+
+def run(df_original, df_perceived):
+    """
+    Runs the Driving Experience effect analysis on the Original & Perceived data.
+
+    Parameters:
+    - df_original (DataFrame): Original data with Acceptance_Score (see utils.prepare_data).
+    - df_perceived (DataFrame): Perceived data with Acceptance_Score.
+
+    Returns:
+    - dict: p-values of the tests, normality results, summary statistics and the
+            Original vs. Perceived comparisons.
+    """
+    comparisons = {}
+
+    # Print column names to check if "Age" exists
+    # print("\nOriginal Data Columns:", df_original.columns.tolist())
+    # print("\nPerceived Data Columns:", df_perceived.columns.tolist())
+
+    # Step 4 : Check normality
+    is_normal_original = check_normality(df_original, target_variable, "Original")
+    is_normal_perceived = check_normality(df_perceived, target_variable, "Perceived")
+
+    # step 5: performing the statiscal test 
+
+    p_values = {}
+
+    if is_normal_original:
+        p_values["one-way anova (Original)"] =  one_way_anova(df_original, categorical_variable,target_variable, "Original")
+    else:
+        p_values["Krushal Wills (Original)"] = kruskal_wallis(df_original, categorical_variable, target_variable, "Original")
+
+    if is_normal_perceived:
+        p_values["one-way anova (Perceived)"] = one_way_anova(df_perceived,categorical_variable,  target_variable, "Perceived")
+    else:
+        p_values["Krushal Wills (Perceived)"] = kruskal_wallis(df_perceived, categorical_variable,  target_variable, "Perceived")
+
+    print("\n📊 **P-Value Results Summary:**")
+    for test, p_val in p_values.items():
+        print(f"{test}: p = {p_val:.5f} {'✅ Significant' if p_val < 0.10 else '❌ Not Significant'}")
+
+    significant_original = any(p < 0.10 for key, p in p_values.items() if "Original" in key)
+    significant_perceived = any(p < 0.10 for key, p in p_values.items() if "Perceived" in key)
+
+    mean_median_original = compare_mean_median(df_original, categorical_variable, target_variable, "Original")
+    mean_median_perceived = compare_mean_median(df_perceived, categorical_variable, target_variable, "Perceived")
+
+
+
+    # Define consistent driving experience labels
+    experience_groups_original = {"< 2 years": "< 2 years", "2 to 5 years": "2 to 5 years", "> 5 years": "> 5 years"}
+    experience_groups_perceived = {"No experience": "No experience", "< 2 years": "< 2 years", "2 to 5 years": "2 to 5 years", "> 5 years": "> 5 years"}
+
+    # Generate Driving Experience Plots for Original Data and Perceived Data
+    plot_driving_experience(df_original, categorical_variable, target_variable, "Original", experience_groups_original)
+    plot_driving_experience(df_perceived, categorical_variable, target_variable, "Perceived", experience_groups_perceived)
+
+
+    # visualization
+    # fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+
+    # sns.boxplot(x=categorical_variable, y=target_variable, data=df_original, ax=axes[0])
+    # axes[0].set_title(f"Original Data: {target_variable} by Age")
 
-    plt.show()
+    # sns.boxplot(x=categorical_variable, y=target_variable, data=df_perceived, ax=axes[1])
+    # axes[1].set_title(f"Perceived Data: {target_variable} by Age")
 
-# Define consistent driving experience labels
-experience_groups_original = {"< 2 years": "< 2 years", "2 to 5 years": "2 to 5 years", "> 5 years": "> 5 years"}
-experience_groups_perceived = {"No experience": "No experience", "< 2 years": "< 2 years", "2 to 5 years": "2 to 5 years", "> 5 years": "> 5 years"}
+    # plt.tight_layout()
 
-# Generate Driving Experience Plots for Original Data and Perceived Data
-plot_driving_experience(df_original, categorical_variable, target_variable, "Original", experience_groups_original)
-plot_driving_experience(df_perceived, categorical_variable, target_variable, "Perceived", experience_groups_perceived)
+    # plt.savefig("plot/driving_experience_effect_plot.png")
+    # print("\n✅ Plot saved as 'plot/driving_experience_effect_plot.png'")
 
+    driving_original = df_original[df_original[categorical_variable] == "< 2 years"][target_variable]
+    driving_perceived = df_perceived[df_perceived[categorical_variable] == "< 2 years"][target_variable]
 
-# visualization
-# fig, axes = plt.subplots(1, 2, figsize=(12, 5))
+    is_normal_driving_original = check_normality_on_filtered_data(driving_original, "< 2 years original")
+    is_normal_driving_perceived = check_normality_on_filtered_data(driving_perceived, "<2 years Perceived")
 
-# sns.boxplot(x=categorical_variable, y=target_variable, data=df_original, ax=axes[0])
-# axes[0].set_title(f"Original Data: {target_variable} by Age")
+    if is_normal_driving_original and is_normal_driving_perceived:
+        t_stat, p_value = ttest_ind(driving_original, driving_perceived)
+        print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    else:
+        u_stat, p_value = mannwhitneyu(driving_original, driving_perceived, alternative='two-sided')
+        print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    comparisons["< 2 years"] = p_value
 
-# sns.boxplot(x=categorical_variable, y=target_variable, data=df_perceived, ax=axes[1])
-# axes[1].set_title(f"Perceived Data: {target_variable} by Age")
 
-# plt.tight_layout()
+    driving_original = df_original[df_original[categorical_variable] == "2 to 5 years"][target_variable]
+    driving_perceived = df_perceived[df_perceived[categorical_variable] == "2 to 5 years"][target_variable]
 
-# plt.savefig("plot/driving_experience_effect_plot.png")
-# print("\n✅ Plot saved as 'plot/driving_experience_effect_plot.png'")
+    is_normal_driving_original = check_normality_on_filtered_data(driving_original, "2 to 5 years original")
+    is_normal_driving_perceived = check_normality_on_filtered_data(driving_perceived, "2 to 5 years Perceived")
 
-driving_original = df_original[df_original[categorical_variable] == "< 2 years"][target_variable]
-driving_perceived = df_perceived[df_perceived[categorical_variable] == "< 2 years"][target_variable]
+    if is_normal_driving_original and is_normal_driving_perceived:
+        t_stat, p_value = ttest_ind(driving_original, driving_perceived)
+        print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    else:
+        u_stat, p_value = mannwhitneyu(driving_original, driving_perceived, alternative='two-sided')
+        print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    comparisons["2 to 5 years"] = p_value
 
-is_normal_driving_original = check_normality_on_filtered_data(driving_original, "< 2 years original")
-is_normal_driving_perceived = check_normality_on_filtered_data(driving_perceived, "<2 years Perceived")
 
-if is_normal_driving_original and is_normal_driving_perceived:
-    t_stat, p_value = ttest_ind(driving_original, driving_perceived)
-    print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
-else:
-    u_stat, p_value = mannwhitneyu(driving_original, driving_perceived, alternative='two-sided')
-    print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    driving_original = df_original[df_original[categorical_variable] == "> 5 years"][target_variable]
+    driving_perceived = df_perceived[df_perceived[categorical_variable] == "> 5 years"][target_variable]
 
+    is_normal_driving_original = check_normality_on_filtered_data(driving_original, "> 5 years original")
+    is_normal_driving_perceived = check_normality_on_filtered_data(driving_perceived, "> 5 years Perceived")
 
-driving_original = df_original[df_original[categorical_variable] == "2 to 5 years"][target_variable]
-driving_perceived = df_perceived[df_perceived[categorical_variable] == "2 to 5 years"][target_variable]
+    if is_normal_driving_original and is_normal_driving_perceived:
+        t_stat, p_value = ttest_ind(driving_original, driving_perceived)
+        print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    else:
+        u_stat, p_value = mannwhitneyu(driving_original, driving_perceived, alternative='two-sided')
+        print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    comparisons["> 5 years"] = p_value
 
-is_normal_driving_original = check_normality_on_filtered_data(driving_original, "2 to 5 years original")
-is_normal_driving_perceived = check_normality_on_filtered_data(driving_perceived, "2 to 5 years Perceived")
+    return {
+        "p_values": p_values,
+        "significant": {"Original": significant_original, "Perceived": significant_perceived},
+        "normality": {"Original": is_normal_original, "Perceived": is_normal_perceived},
+        "summary": {"Original": mean_median_original, "Perceived": mean_median_perceived},
+        "comparisons": comparisons,
+    }
 
-if is_normal_driving_original and is_normal_driving_perceived:
-    t_stat, p_value = ttest_ind(driving_original, driving_perceived)
-    print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
-else:
-    u_stat, p_value = mannwhitneyu(driving_original, driving_perceived, alternative='two-sided')
-    print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
 
+if __name__ == "__main__":
+    # Step 1 to 3: Load Data, check reliability & calculate the acceptance score
+    df_original, df_perceived = prepare_data("data sheet.xlsx")
 
-driving_original = df_original[df_original[categorical_variable] == "> 5 years"][target_variable]
-driving_perceived = df_perceived[df_perceived[categorical_variable] == "> 5 years"][target_variable]
+    # after calculation of acceptance for both datasets save e, eou and acceptance in the excel
 
-is_normal_driving_original = check_normality_on_filtered_data(driving_original, "> 5 years original")
-is_normal_driving_perceived = check_normality_on_filtered_data(driving_perceived, "> 5 years Perceived")
+    save_updated_data(df_original, df_perceived)
 
-if is_normal_driving_original and is_normal_driving_perceived:
-    t_stat, p_value = ttest_ind(driving_original, driving_perceived)
-    print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
-else:
-    u_stat, p_value = mannwhitneyu(driving_original, driving_perceived, alternative='two-sided')
-    print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    run(df_original, df_perceived)
@@ -2,7 +2,8 @@
 
 import matplotlib.pyplot as plt
 import numpy as np
-from utils import load_data, check_reliability, check_normality,calculate_acceptance_score, save_updated_data, compare_mean_median, check_normality_on_filtered_data
+from utils import prepare_data, check_normality, save_updated_data, compare_mean_median, describe_groups, check_normality_on_filtered_data
+from plotting import submit_plot
 from parametric_tests import one_way_anova, ind_t_test
 from non_parametric_tests import kruskal_wallis, mann_whitney_u_test
 from scipy.stats import mannwhitneyu, ttest_ind
@@ -11,68 +12,8 @@ from scipy.stats import mannwhitneyu, ttest_ind
 target_variable = "Acceptance_Score"
 categorical_variable = "Driver education"
 
-# Step 1 - load Original & Perceived Data
-df_original, df_perceived = load_data("data sheet.xlsx")
 
-# Ensure all column names are stripped of spaces
-df_original.columns = df_original.columns.str.strip()
-df_perceived.columns = df_perceived.columns.str.strip()
-
-# Step 2 - Perform Cronbach's Alpha (Reliability Test) on both datasets
-alpha_original = check_reliability(df_original)
-if alpha_original > 0.7:
-    print(f"✅ Cronbach's Alpha for Original Data: {alpha_original:.3f} (accepted, alpha > 0.7)")
-else:
-    print(f"❌ Cronbach's Alpha for Original Data: {alpha_original:.3f} (rejected, alpha < 0.7)")
-
-alpha_perceived = check_reliability(df_perceived)
-if alpha_perceived > 0.7:
-    print(f"✅ Cronbach's Alpha for Perceived Data: {alpha_perceived:.3f} (accepted, alpha > 0.7)")
-else:
-    print(f"❌ Cronbach's Alpha for Perceived Data: {alpha_perceived:.3f} (rejected, alpha < 0.7)")
-
-
-# Step 3 - calculate the acceptance score 
-df_original = calculate_acceptance_score(df_original, "Original")
-df_perceived = calculate_acceptance_score(df_perceived, "Perceived")
-
-# after calculation of acceptance for both datasets save e, eou and acceptance in the excel
-
-save_updated_data(df_original, df_perceived)
-
-# Print column names to check if "Age" exists
-# print("\nOriginal Data Columns:", df_original.columns.tolist())
-# print("\nPerceived Data Columns:", df_perceived.columns.tolist())
-
-# Step 4 : Check normality
-is_normal_original = check_normality(df_original, target_variable, "Original")
-is_normal_perceived = check_normality(df_perceived, target_variable, "Perceived")
-
-# step 5: performing the statiscal test 
-
-p_values = {}
-
-if is_normal_original:
-    p_values["independent t-test (Original)"] = ind_t_test(df_original, categorical_variable,target_variable, "Original")
-else:
-     p_values["Mann Whitey U (Original)"]  = mann_whitney_u_test(df_original, categorical_variable, target_variable, "Original")
-
-if is_normal_perceived:
-     p_values["one-way anova (Perceived)"]  = one_way_anova(df_perceived,categorical_variable,  target_variable, "Perceived")
-else:
-    p_values["Krushal Wills (Perceived)"] = kruskal_wallis(df_perceived, categorical_variable,  target_variable, "Perceived")
-
-print("\n📊 **P-Value Results Summary:**")
-for test, p_val in p_values.items():
-    print(f"{test}: p = {p_val:.5f} {'✅ Significant' if p_val < 0.10 else '❌ Not Significant'}")
-
-significant_original = any(p < 0.10 for key, p in p_values.items() if "Original" in key)
-significant_perceived = any(p < 0.10 for key, p in p_values.items() if "Perceived" in key)
-
-mean_median_original = compare_mean_median(df_original, categorical_variable, target_variable, "Original")
-mean_median_perceived = compare_mean_median(df_perceived, categorical_variable, target_variable, "Perceived")
-
-def plot_driver_education(df, categorical_var, target_variable, dataset_name, education_groups_display_map):
+def draw_driver_education(summary_stats, target_variable, dataset_name, education_groups_display_map):
     """
     Plots Mean & Median in a bar chart with error bars for Driver Education groups.
     - Mean → Error bars using Standard Error (SE).
@@ -81,22 +22,6 @@ def plot_driver_education(df, categorical_var, target_variable, dataset_name, ed
     - Separate plots for Original & Perceived Data.
     - Ensures missing categories are handled correctly.
     """
-    # Compute Mean, SE, Median, and IQR
-    summary_stats = df.groupby(categorical_var)[target_variable].agg(
-        mean="mean",
-        std="std",
-        count="count",
-        median="median",
-        q1=lambda x: np.percentile(x, 25),
-        q3=lambda x: np.percentile(x, 75)
-    )
-
-    # Compute Standard Error (SE) for Mean
-    summary_stats["se"] = summary_stats["std"] / np.sqrt(summary_stats["count"])
-
-    # Compute IQR (Interquartile Range) for Median
-    summary_stats["iqr"] = summary_stats["q3"] - summary_stats["q1"]
-
     # Rename education labels for consistency
     summary_stats = summary_stats.rename(index=education_groups_display_map)
 
@@ -175,63 +100,135 @@ def plot_driver_education(df, categorical_var, target_variable, dataset_name, ed
     legend2 = ax.legend(title="Statistical Measure", loc="upper left", bbox_to_anchor=(1, 0.8))
     ax.add_artist(legend1)
 
-    # Save plot
-    plt.savefig(f"plot/{dataset_name.lower()}_driver_education_error_plot.png")
-    print(f"\n✅ Plot saved as 'plot/{dataset_name.lower()}_driver_education_error_plot.png'")
+    return fig
+
+
+def plot_driver_education(df, categorical_var, target_variable, dataset_name, education_groups_display_map):
+    """
+    Computes the summary table and submits the plot drawn by draw_driver_education.
+    """
+    summary_stats = describe_groups(df, categorical_var, target_variable)
+    submit_plot(draw_driver_education, f"plot/{dataset_name.lower()}_driver_education_error_plot.png", summary_stats, target_variable, dataset_name, education_groups_display_map)
+
+
+def run(df_original, df_perceived):
+    """
+    Runs the Driver Education effect analysis on the Original & Perceived data.
+
+    Parameters:
+    - df_original (DataFrame): Original data with Acceptance_Score (see utils.prepare_data).
+    - df_perceived (DataFrame): Perceived data with Acceptance_Score.
+
+    Returns:
+    - dict: p-values of the tests, normality results, summary statistics and the
+            Original vs. Perceived comparisons.
+    """
+    comparisons = {}
+
+    # Print column names to check if "Age" exists
+    # print("\nOriginal Data Columns:", df_original.columns.tolist())
+    # print("\nPerceived Data Columns:", df_perceived.columns.tolist())
+
+    # Step 4 : Check normality
+    is_normal_original = check_normality(df_original, target_variable, "Original")
+    is_normal_perceived = check_normality(df_perceived, target_variable, "Perceived")
+
+    # step 5: performing the statiscal test 
+
+    p_values = {}
+
+    if is_normal_original:
+        p_values["independent t-test (Original)"] = ind_t_test(df_original, categorical_variable,target_variable, "Original")
+    else:
+         p_values["Mann Whitey U (Original)"]  = mann_whitney_u_test(df_original, categorical_variable, target_variable, "Original")
+
+    if is_normal_perceived:
+         p_values["one-way anova (Perceived)"]  = one_way_anova(df_perceived,categorical_variable,  target_variable, "Perceived")
+    else:
+        p_values["Krushal Wills (Perceived)"] = kruskal_wallis(df_perceived, categorical_variable,  target_variable, "Perceived")
+
+    print("\n📊 **P-Value Results Summary:**")
+    for test, p_val in p_values.items():
+        print(f"{test}: p = {p_val:.5f} {'✅ Significant' if p_val < 0.10 else '❌ Not Significant'}")
+
+    significant_original = any(p < 0.10 for key, p in p_values.items() if "Original" in key)
+    significant_perceived = any(p < 0.10 for key, p in p_values.items() if "Perceived" in key)
+
+    mean_median_original = compare_mean_median(df_original, categorical_variable, target_variable, "Original")
+    mean_median_perceived = compare_mean_median(df_perceived, categorical_variable, target_variable, "Perceived")
+
+
+
+    # Define consistent driver education labels
+    education_groups_original = {"> Bachelor's degree": "> Bachelor's degree", "Bachelor's degree": "Bachelor's degree"}
+    education_groups_perceived = {"> Bachelor's degree": "> Bachelor's degree", "Bachelor's degree": "Bachelor's degree", "< Bachelor's degree": "< Bachelor's degree"}
+
+    # Generate Driver Education Plots for Original Data and Perceived Data
+    plot_driver_education(df_original, categorical_variable, target_variable, "Original", education_groups_original)
+    plot_driver_education(df_perceived, categorical_variable, target_variable, "Perceived", education_groups_perceived)
+
 
-    plt.show()
 
+    # visualization
+    # fig, axes = plt.subplots(1, 2, figsize=(12, 5))
 
-# Define consistent driver education labels
-education_groups_original = {"> Bachelor's degree": "> Bachelor's degree", "Bachelor's degree": "Bachelor's degree"}
-education_groups_perceived = {"> Bachelor's degree": "> Bachelor's degree", "Bachelor's degree": "Bachelor's degree", "< Bachelor's degree": "< Bachelor's degree"}
+    # sns.boxplot(x=categorical_variable, y=target_variable, data=df_original, ax=axes[0])
+    # axes[0].set_title(f"Original Data: {target_variable} by Age")
 
-# Generate Driver Education Plots for Original Data and Perceived Data
-plot_driver_education(df_original, categorical_variable, target_variable, "Original", education_groups_original)
-plot_driver_education(df_perceived, categorical_variable, target_variable, "Perceived", education_groups_perceived)
+    # sns.boxplot(x=categorical_variable, y=target_variable, data=df_perceived, ax=axes[1])
+    # axes[1].set_title(f"Perceived Data: {target_variable} by Age")
 
+    # plt.tight_layout()
 
+    # plt.savefig("plot/education_effect_plot.png")
+    # print("\n✅ Plot saved as 'plot/education_effect_plot.png'")
 
-# visualization
-# fig, axes = plt.subplots(1, 2, figsize=(12, 5))
 
-# sns.boxplot(x=categorical_variable, y=target_variable, data=df_original, ax=axes[0])
-# axes[0].set_title(f"Original Data: {target_variable} by Age")
+    edu_original = df_original[df_original[categorical_variable] == "Bachelor's degree"][target_variable]
+    edu_perceived = df_perceived[df_perceived[categorical_variable] == "Bachelor's degree"][target_variable]
 
-# sns.boxplot(x=categorical_variable, y=target_variable, data=df_perceived, ax=axes[1])
-# axes[1].set_title(f"Perceived Data: {target_variable} by Age")
+    is_normal_edu_original = check_normality_on_filtered_data(edu_original, "Bachelor's degree original")
+    is_normal_edu_perceived = check_normality_on_filtered_data(edu_perceived, "Bachelor's degree Perceived")
 
-# plt.tight_layout()
+    if is_normal_edu_original and is_normal_edu_perceived:
+        t_stat, p_value = ttest_ind(edu_original, edu_perceived)
+        print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    else:
+        u_stat, p_value = mannwhitneyu(edu_original, edu_perceived, alternative='two-sided')
+        print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    comparisons["Bachelor's degree"] = p_value
 
-# plt.savefig("plot/education_effect_plot.png")
-# print("\n✅ Plot saved as 'plot/education_effect_plot.png'")
 
 
-edu_original = df_original[df_original[categorical_variable] == "Bachelor's degree"][target_variable]
-edu_perceived = df_perceived[df_perceived[categorical_variable] == "Bachelor's degree"][target_variable]
+    edu_original = df_original[df_original[categorical_variable] == "> Bachelor's degree"][target_variable]
+    edu_perceived = df_perceived[df_perceived[categorical_variable] == "> Bachelor's degree"][target_variable]
 
-is_normal_edu_original = check_normality_on_filtered_data(edu_original, "Bachelor's degree original")
-is_normal_edu_perceived = check_normality_on_filtered_data(edu_perceived, "Bachelor's degree Perceived")
+    is_normal_edu_original = check_normality_on_filtered_data(edu_original, "> Bachelor's degree original")
+    is_normal_edu_perceived = check_normality_on_filtered_data(edu_perceived, "> Bachelor's degree Perceived")
 
-if is_normal_edu_original and is_normal_edu_perceived:
-    t_stat, p_value = ttest_ind(edu_original, edu_perceived)
-    print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
-else:
-    u_stat, p_value = mannwhitneyu(edu_original, edu_perceived, alternative='two-sided')
-    print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    if is_normal_edu_original and is_normal_edu_perceived:
+        t_stat, p_value = ttest_ind(edu_original, edu_perceived)
+        print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    else:
+        u_stat, p_value = mannwhitneyu(edu_original, edu_perceived, alternative='two-sided')
+        print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    comparisons["> Bachelor's degree"] = p_value
 
+    return {
+        "p_values": p_values,
+        "significant": {"Original": significant_original, "Perceived": significant_perceived},
+        "normality": {"Original": is_normal_original, "Perceived": is_normal_perceived},
+        "summary": {"Original": mean_median_original, "Perceived": mean_median_perceived},
+        "comparisons": comparisons,
+    }
 
 
-edu_original = df_original[df_original[categorical_variable] == "> Bachelor's degree"][target_variable]
-edu_perceived = df_perceived[df_perceived[categorical_variable] == "> Bachelor's degree"][target_variable]
+if __name__ == "__main__":
+    # Step 1 to 3: Load Data, check reliability & calculate the acceptance score
+    df_original, df_perceived = prepare_data("data sheet.xlsx")
 
-is_normal_edu_original = check_normality_on_filtered_data(edu_original, "> Bachelor's degree original")
-is_normal_edu_perceived = check_normality_on_filtered_data(edu_perceived, "> Bachelor's degree Perceived")
+    # after calculation of acceptance for both datasets save e, eou and acceptance in the excel
 
-if is_normal_edu_original and is_normal_edu_perceived:
-    t_stat, p_value = ttest_ind(edu_original, edu_perceived)
-    print(f"t-test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
-else:
-    u_stat, p_value = mannwhitneyu(edu_original, edu_perceived, alternative='two-sided')
-    print(f"Mann-Whitney U Test: p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+    save_updated_data(df_original, df_perceived)
 
+    run(df_original, df_perceived)
@@ -0,0 +1,177 @@
+import os
+import pickle
+from itertools import combinations
+
+from accumulators import (
+    cell_moments, kruskal_from_histogram, merge_histograms, merge_moments, normality_from_histogram,
+    two_way_anova_from_moments
+)
+from reliability import new_reliability_moments, reliability_from_moments, report_reliability_table, update_reliability_moments
+from streaming import fold_chunk, summarize_accumulators
+from utils import CACHE_DIR, CATEGORICAL_COLUMNS, add_acceptance_score, load_data
+
+# Incremental re-analysis for appended respondents.
+#
+# For every dataset the state keeps the respondent IDs already folded in, the reliability
+# accumulator behind Cronbach's alpha and its bootstrap CIs (see reliability.py), the
+# histogram of every Acceptance_Score, and per-factor and per-pair accumulators of it (see
+# accumulators.py). An update scores only the rows whose ID is new and merges their
+# accumulators into the state, so refreshing the results costs O(new rows) plus O(cells).
+# Rows are assumed to be appended only: if an ID disappears the state is rebuilt.
+
+# respondent ID column of the Original and Perceived sheets
+ID_COLUMNS = ("Driver No.", "Sr No.")
+
+TARGET_VARIABLE = "Acceptance_Score"
+
+# bumped whenever the layout of the state changes, older state files are rebuilt
+STATE_VERSION = 3
+
+
+def _state_path(file_path):
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR)
+    stem = os.path.splitext(os.path.basename(file_path))[0].replace(" ", "_")
+    return os.path.join(cache_dir, f"{stem}-incremental.pkl")
+
+
+def _id_column(df):
+    for column in ID_COLUMNS:
+        if column in df.columns:
+            return column
+    raise KeyError(f"❌ No respondent ID column ({' / '.join(ID_COLUMNS)}) found!")
+
+
+# Empty accumulator state of one dataset
+def new_dataset_state(id_column, factors=CATEGORICAL_COLUMNS):
+    return {
+        "id_column": id_column,
+        "ids": set(),
+        "reliability": new_reliability_moments(seed=0),
+        "scores": None,
+        "factor_names": list(factors),
+        "factors": {},
+        "pairs": {pair: None for pair in combinations(factors, 2)},
+    }
+
+
+# Fold respondents not seen before into a dataset state
+def append_respondents(state, df):
+    """
+    Scores the rows of `df` whose respondent ID is not in the state yet and merges them
+    into the state's accumulators in place. Rows already folded in are skipped.
+
+    Parameters:
+    - state (dict): State from new_dataset_state (or a previous update).
+    - df (DataFrame): The whole sheet or just the new rows, with the raw ratings.
+
+    Returns:
+    - int: Number of new respondents.
+    """
+    df = df.rename(columns=str.strip)
+    id_column = state["id_column"]
+    new_rows = df[~df[id_column].isin(state["ids"])]
+    if new_rows.empty:
+        return 0
+
+    new_rows = add_acceptance_score(new_rows.copy())
+    state["ids"].update(new_rows[id_column].tolist())
+
+    update_reliability_moments(state["reliability"], new_rows)
+    # whole-sample histogram, so the normality test keeps rows with a missing factor
+    scores = new_rows[TARGET_VARIABLE].dropna().value_counts().sort_index()
+    state["scores"] = scores if state["scores"] is None else merge_histograms(state["scores"], scores)
+    fold_chunk(state["factors"], new_rows, state["factor_names"], TARGET_VARIABLE)
+    for pair, moments in state["pairs"].items():
+        chunk = cell_moments(new_rows, list(pair), TARGET_VARIABLE)
+        state["pairs"][pair] = chunk if moments is None else merge_moments(moments, chunk)
+    return len(new_rows)
+
+
+# Results of one dataset from its accumulators
+def incremental_results(state, dataset_name=None):
+    """
+    Computes Cronbach's alpha with bootstrap CIs and alpha-if-item-deleted, the normality
+    of the Acceptance_Score, per-factor summaries with one-way ANOVA and Kruskal-Wallis,
+    and the two-way ANOVA of every pair of factors, all from the accumulators of a dataset state.
+
+    Parameters:
+    - state (dict): Dataset state after append_respondents.
+    - dataset_name (str): If given, print the results.
+
+    Returns:
+    - dict: n, reliability (table of reliability.reliability_from_moments), normality
+      (test, p-value), factors ({factor: {"summary", "anova", "kruskal_p"}}) and
+      interactions ({(factor 1, factor 2): ANOVA table}).
+    """
+    reliability = reliability_from_moments(state["reliability"])
+    factors = summarize_accumulators(state["factors"], dataset_name)
+    test_used, normality_p = normality_from_histogram(state["scores"])
+    for factor, accumulator in state["factors"].items():
+        factors[factor]["kruskal_p"] = kruskal_from_histogram(accumulator["histogram"])[1]
+    interactions = {pair: two_way_anova_from_moments(moments) for pair, moments in state["pairs"].items()}
+
+    if dataset_name is not None:
+        report_reliability_table(reliability, dataset_name)
+        print(f"✅ {test_used} Test for Normality on {TARGET_VARIABLE} column in {dataset_name} data: p = {normality_p:.3f} -> {'Normal' if normality_p > 0.1 else 'Not Normal'}")
+        for factor, result in factors.items():
+            p_value = result["kruskal_p"]
+            print(f"✅ Kruskal-Wallis Test for {dataset_name} Data (Factor: {factor}): p = {p_value:.3f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
+        for (first, second), table in interactions.items():
+            p_value = table["PR(>F)"].iloc[2]
+            print(f"🔹 Two-Way ANOVA for {dataset_name} Data ({first} x {second}): interaction p = {p_value:.3f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
+
+    return {
+        "n": len(state["ids"]),
+        "reliability": reliability,
+        "normality": (test_used, normality_p),
+        "factors": factors,
+        "interactions": interactions,
+    }
+
+
+# Refresh the results with the respondents appended since the last update
+def update_analysis(file_path="data sheet.xlsx", dataset_names=("Original", "Perceived"), reset=False):
+    """
+    Folds the respondents added to the workbook since the previous call into the saved
+    accumulator state (".cache/<workbook>-incremental.pkl") and prints refreshed results.
+
+    Parameters:
+    - file_path (str): Path of the Excel workbook.
+    - dataset_names (tuple): Names of the two sheets for printing.
+    - reset (bool): Ignore the saved state and fold in every respondent.
+
+    Returns:
+    - dict: {dataset name: incremental_results(...)}
+    """
+    state_path = _state_path(file_path)
+    state = {}
+    if not reset and os.path.exists(state_path):
+        try:
+            with open(state_path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            state = {}
+        if state.get("version") != STATE_VERSION:
+            state = {}
+
+    results = {}
+    for dataset_name, df in zip(dataset_names, load_data(file_path)):
+        id_column = _id_column(df)
+        dataset = state.get(dataset_name)
+        if dataset is not None and (dataset["id_column"] != id_column or not dataset["ids"].issubset(set(df[id_column]))):
+            print(f"⚠️ Respondents were removed from the {dataset_name} Data, rebuilding its state.")
+            dataset = None
+        if dataset is None:
+            dataset = new_dataset_state(id_column)
+        added = append_respondents(dataset, df)
+        state[dataset_name] = dataset
+        print(f"\n📊 **{dataset_name} Data: {added} new respondent(s), {len(dataset['ids'])} in total**")
+        results[dataset_name] = incremental_results(dataset, dataset_name)
+
+    state["version"] = STATE_VERSION
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, state_path)
+    return results
@@ -1,54 +1,217 @@
+import argparse
+import contextlib
+import importlib
+import io
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-print("\nChoose an analysis to perform:")
-print("1 - Effect of Gender on ADAS (Both Original & Perceived Data)")
-print("2 - Effect of Age on ADAS (Both Original & Perceived Data)")
-print("3 - Effect of Driving Experience of Drivers on ADAS (Both Original & Perceived Data)")
-print("4 - Effect of Education on ADAS (Both Original & Perceived Data)")
-print("5 - Effect of Crash Experience of Driver on ADAS (Both Original & Perceived Data)")
-print("6 - Effect of Age x Gender on ADAS (Both Original & Perceived Data)")
-print("7 - Effect of Age x Crash Experience on ADAS (Both Original & Perceived Data)")
-print("8 - Effect of Age x Driver Education on ADAS (Both Original & Perceived Data)")
-print("9 - Effect of Age x Drving Experience on ADAS (Both Original & Perceived Data)")
-print("10 - Effect of Gender x Crash Experience on ADAS (Both Original & Perceived Data)")
-print("11 - Effect of Gender x Driver Education on ADAS (Both Original & Perceived Data)")
-print("12 - Effect of Gender x Driving Experience on ADAS (Both Original & Perceived Data)")
-print("13 - Effect of Driving Experience x Crash Experience on ADAS (Both Original & Perceived Data)")
-print("14 - Effect of Driving Experience x Driver Education on ADAS (Both Original & Perceived Data)")
-print("15 - Effect of Driver Education x Crash Experience on ADAS (Both Original & Perceived Data)")
-os.makedirs("plot", exist_ok=True)
-
-choice = input("\nEnter your choice: ")
-
-if choice == "1":
-    os.system("python3 gender_effect_analysis.py")
-elif choice == "2":
-    os.system("python3 age_effect_analysis.py")
-elif choice == "3":
-    os.system("python3 driving_experience_analysis.py")
-elif choice == "4":
-    os.system("python3 education_effect_analysis.py")
-elif choice == "5":
-    os.system("python3 crash_experience_effect_analysis.py")
-elif choice == "6":
-    os.system("python3 age_gender_effect_analysis.py")
-elif choice == "7":
-    os.system("python3 age_crash_effect_analysis.py")
-elif choice == "8":
-    os.system("python3 age_education_effect_analysis.py")
-elif choice == "9":
-    os.system("python3 age_driving_effect_analysis.py")
-elif choice == "10":
-    os.system("python3 gender_crash_effect_analysis.py")
-elif choice == "11":
-    os.system("python3 gender_education_effect_analysis.py")
-elif choice == "12":
-    os.system("python3 gender_driving_effect_analysis.py")
-elif choice == "13":
-    os.system("python3 driving_crash_effect_analysis.py")
-elif choice == "14":
-    os.system("python3 driving_education_effect_analysis.py")
-elif choice == "15":
-    os.system("python3 education_crash_effect_analysis.py")
-else:
-    print("Invalid choice! Please run the script again.")
+DATA_FILE = "data sheet.xlsx"
+
+# choice -> (description, analysis script)
+ANALYSES = {
+    "1": ("Effect of Gender on ADAS (Both Original & Perceived Data)", "gender_effect_analysis.py"),
+    "2": ("Effect of Age on ADAS (Both Original & Perceived Data)", "age_effect_analysis.py"),
+    "3": ("Effect of Driving Experience of Drivers on ADAS (Both Original & Perceived Data)", "driving_experience_analysis.py"),
+    "4": ("Effect of Education on ADAS (Both Original & Perceived Data)", "education_effect_analysis.py"),
+    "5": ("Effect of Crash Experience of Driver on ADAS (Both Original & Perceived Data)", "crash_experience_effect_analysis.py"),
+    "6": ("Effect of Age x Gender on ADAS (Both Original & Perceived Data)", "age_gender_effect_analysis.py"),
+    "7": ("Effect of Age x Crash Experience on ADAS (Both Original & Perceived Data)", "age_crash_effect_analysis.py"),
+    "8": ("Effect of Age x Driver Education on ADAS (Both Original & Perceived Data)", "age_education_effect_analysis.py"),
+    "9": ("Effect of Age x Drving Experience on ADAS (Both Original & Perceived Data)", "age_driving_effect_analysis.py"),
+    "10": ("Effect of Gender x Crash Experience on ADAS (Both Original & Perceived Data)", "gender_crash_effect_analysis.py"),
+    "11": ("Effect of Gender x Driver Education on ADAS (Both Original & Perceived Data)", "gender_education_effect_analysis.py"),
+    "12": ("Effect of Gender x Driving Experience on ADAS (Both Original & Perceived Data)", "gender_driving_effect_analysis.py"),
+    "13": ("Effect of Driving Experience x Crash Experience on ADAS (Both Original & Perceived Data)", "driving_crash_effect_analysis.py"),
+    "14": ("Effect of Driving Experience x Driver Education on ADAS (Both Original & Perceived Data)", "driving_education_effect_analysis.py"),
+    "15": ("Effect of Driver Education x Crash Experience on ADAS (Both Original & Perceived Data)", "education_crash_effect_analysis.py"),
+}
+
+
+def run_analysis(choice, plots=None):
+    """
+    Runs one analysis in this interpreter by calling the run() function of its module.
+
+    Parameters:
+    - choice (str): Key of ANALYSES.
+    - plots (list): If given, the plots of the analysis are appended to it as specs
+      (see plotting.py) instead of being drawn here.
+
+    Returns:
+    - tuple: (choice, script, wall time in seconds, error message or None, result dict or None)
+    """
+    from plotting import collect_plots
+    from utils import prepare_data, use_batch_rendering
+
+    # never block on a GUI window when running non-interactively
+    use_batch_rendering()
+    import matplotlib.pyplot as plt
+
+    script = ANALYSES[choice][1]
+    print(f"\n{'=' * 20} {choice} - {script} {'=' * 20}")
+    start = time.perf_counter()
+    error, result, specs = None, None, []
+    try:
+        module = importlib.import_module(os.path.splitext(script)[0])
+        with collect_plots() if plots is not None else contextlib.nullcontext(specs) as specs:
+            result = module.run(*prepare_data(DATA_FILE))
+    except Exception as e:
+        error = repr(e)
+        print(f"❌ {script} failed: {error}")
+    finally:
+        plt.close("all")
+    if plots is not None:
+        plots.extend(specs)
+    return choice, script, time.perf_counter() - start, error, result
+
+
+def run_in_process(choices, export_file="updated_data.xlsx", plot_jobs=1):
+    """
+    Runs the chosen analyses one after another in this interpreter.
+
+    The libraries are imported once and utils.prepare_data keeps the scored datasets
+    in memory, so the workbook is loaded, scored and saved only once for the whole run.
+    With plot_jobs other than 1, the plots of each analysis are handed to a pool of
+    plot workers as soon as its statistics are done, and drawn while the next one runs.
+
+    Returns:
+    - list: (choice, script, wall time in seconds, error or None, result or None) for each analysis.
+    """
+    from plotting import plot_pool, render_plot_captured
+    from utils import prepare_data, save_updated_data
+
+    save_updated_data(*prepare_data(DATA_FILE), file_name=export_file)
+    if plot_jobs == 1:
+        return [run_analysis(choice) for choice in choices]
+
+    timings, rendered = [], []
+    with plot_pool(plot_jobs or None) as pool:
+        for choice in choices:
+            plots = []
+            timings.append(run_analysis(choice, plots))
+            rendered += [pool.submit(render_plot_captured, spec) for spec in plots]
+        for future in rendered:
+            print(future.result(), end="")
+    return timings
+
+
+def _init_worker(spec):
+    from utils import attach_prepared_data
+    attach_prepared_data(spec)
+
+
+def _run_analysis_captured(choice, collect_plots=False):
+    # keep each analysis' output together so the parent can print the report in order
+    output, plots = io.StringIO(), [] if collect_plots else None
+    with contextlib.redirect_stdout(output):
+        timing = run_analysis(choice, plots)
+    return timing, output.getvalue(), plots or []
+
+
+def run_parallel(choices, max_workers=None, export_file="updated_data.xlsx", plot_jobs=1):
+    """
+    Runs the chosen analyses concurrently on a process pool.
+
+    The workbook is loaded and scored once here and published through shared memory;
+    every worker attaches to it instead of receiving pickled DataFrames. The output of
+    each analysis is printed in the order of `choices` once all of them have finished.
+    With plot_jobs other than 1, the workers only compute statistics and return their
+    plots as specs, which are then drawn on a separate pool of plot workers.
+
+    Returns:
+    - list: (choice, script, wall time in seconds, error or None, result or None) for each analysis.
+    """
+    from plotting import render_plots
+    from utils import prepare_data, save_updated_data, share_prepared_data
+
+    max_workers = max_workers or min(os.cpu_count() or 1, len(choices))
+    save_updated_data(*prepare_data(DATA_FILE), file_name=export_file)
+    block, spec = share_prepared_data(DATA_FILE)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(spec,)) as pool:
+            results = list(pool.map(_run_analysis_captured, choices, [plot_jobs != 1] * len(choices)))
+    finally:
+        block.close()
+        block.unlink()
+
+    timings, plots = [], []
+    for timing, output, specs in results:
+        print(output, end="")
+        timings.append(timing)
+        plots += specs
+    render_plots(plots, plot_jobs or None)
+    return timings
+
+
+def print_timings(timings):
+    print("\n⏱️ **Wall Time per Analysis:**")
+    for choice, script, seconds, error, _ in timings:
+        print(f"{choice:>3} - {script:<40} {seconds:8.2f} s {'✅' if error is None else '❌ failed'}")
+    print(f"{'Total':<46} {sum(t[2] for t in timings):8.2f} s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="TAM analysis of ADAS acceptance (Original & Perceived Data)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--all", action="store_true", help="run all analyses in one process without prompting")
+    group.add_argument("--only", metavar="CHOICES", help="comma separated analyses to run in one process, e.g. 1,6,13")
+    group.add_argument("--update", action="store_true",
+                       help="refresh the summary results with only the respondents appended since the last --update")
+    parser.add_argument("--jobs", type=int, default=1, metavar="N",
+                        help="with --all/--only, run the analyses on N worker processes (0 = one per CPU core)")
+    parser.add_argument("--plot-jobs", type=int, default=1, metavar="N",
+                        help="with --all/--only, draw the plots on N separate worker processes (0 = one per CPU core, 1 = inline)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="recompute every test instead of reusing the results cached under .cache/results")
+    parser.add_argument("--reset", action="store_true",
+                        help="with --update, discard the saved incremental state and fold in every respondent again")
+    parser.add_argument("--export", default="updated_data.xlsx", metavar="FILE",
+                        help="with --all/--only, where to save the scored data (.xlsx, .parquet or .csv)")
+    args = parser.parse_args()
+
+    from utils import EXPORT_FORMATS
+
+    # fail before any analysis runs rather than when the scored data is saved
+    if os.path.splitext(args.export)[1] not in EXPORT_FORMATS:
+        parser.error(f"argument --export: unsupported format '{args.export}' (use {', '.join(EXPORT_FORMATS)})")
+    return args
+
+
+def main():
+    args = parse_args()
+    os.makedirs("plot", exist_ok=True)
+    if args.no_cache:
+        os.environ["RESULT_CACHE"] = "0"
+
+    if args.update:
+        from incremental import update_analysis
+
+        update_analysis(DATA_FILE, reset=args.reset)
+        return
+
+    if args.all or args.only:
+        choices = list(ANALYSES) if args.all else [c.strip() for c in args.only.split(",") if c.strip()]
+        invalid = [c for c in choices if c not in ANALYSES]
+        if invalid:
+            raise SystemExit(f"Invalid choice(s): {', '.join(invalid)}. Valid choices are 1 to {len(ANALYSES)}.")
+        if args.jobs == 1:
+            timings = run_in_process(choices, export_file=args.export, plot_jobs=args.plot_jobs)
+        else:
+            timings = run_parallel(choices, max_workers=args.jobs or None, export_file=args.export, plot_jobs=args.plot_jobs)
+        print_timings(timings)
+        return
+
+    print("\nChoose an analysis to perform:")
+    for choice, (description, _) in ANALYSES.items():
+        print(f"{choice} - {description}")
+
+    choice = input("\nEnter your choice: ")
+
+    if choice in ANALYSES:
+        os.system(f"python3 {ANALYSES[choice][1]}")
+    else:
+        print("Invalid choice! Please run the script again.")
+
+
+if __name__ == "__main__":
+    main()
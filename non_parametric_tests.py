@@ -1,12 +1,15 @@
 import scipy.stats as stats
-import statsmodels.api as sm
-import statsmodels.formula.api as smf
-import pingouin as pg
 import numpy as np
+import pandas as pd
+
+from accumulators import kruskal_from_histogram, mann_whitney_from_histogram, value_histogram
+from permutation_tests import permutation_label, permutation_test
+from ranks import midranks, rank_values, tie_counts, tie_term
+from result_cache import cached_result
 
 
 # Mann-Whitney U-Test
-def mann_whitney_u_test(df, categorical_var, target_variable, dataset_name):
+def mann_whitney_u_test(df, categorical_var, target_variable, dataset_name, permutations=None, seed=None, n_jobs=1):
     """
     Performs Mann-Whitney U Test for a categorical independent variable.
 
@@ -15,6 +18,10 @@ def mann_whitney_u_test(df, categorical_var, target_variable, dataset_name):
     categorical_var (str): The independent variable (e.g., "Gender").
     target_variable (str): The dependent variable (e.g., "Acceptance_Score").
     dataset_name (str): Name of the dataset for printing results.
+    permutations (int): If given, the p-value comes from a permutation test of the rank sum
+    with this many relabellings (exact when fewer relabellings exist).
+    seed (int): Seed of the permutation test.
+    n_jobs (int): Worker processes for the permutation test (0 = one per CPU core).
 
     Returns:
     float: p-value of the Mann-Whitney U test.
@@ -24,15 +31,29 @@ def mann_whitney_u_test(df, categorical_var, target_variable, dataset_name):
         print(f"❌ Mann-Whitney U Test Failed: {categorical_var} has more than 2 categories.")
         return None
 
-    group1 = df[df[categorical_var] == groups[0]][target_variable]
-    group2 = df[df[categorical_var] == groups[1]][target_variable]
+    histogram = value_histogram(df, categorical_var, target_variable)
+    group_sizes = histogram.groupby(level=0).sum()
+    if group_sizes.min() <= 8 and (histogram.groupby(level=1).sum() == 1).all():
+        # small samples without ties get scipy's exact null distribution
+        group1 = df[df[categorical_var] == groups[0]][target_variable]
+        group2 = df[df[categorical_var] == groups[1]][target_variable]
+        stat, p_value = stats.mannwhitneyu(group1, group2)
+    else:
+        # U from the rows per (group, score); equal to scipy.stats.mannwhitneyu on the raw groups
+        stat, p_value = mann_whitney_from_histogram(histogram, first=groups[0])
+    method = ""
+
+    if permutations:
+        data = df[[categorical_var, target_variable]].dropna()
+        result = permutation_test(rank_values(data[target_variable]), data[categorical_var], "rank_sum",
+                                  n_permutations=permutations, seed=seed, n_jobs=n_jobs)
+        p_value, method = result["p_value"], f" ({permutation_label(result)})"
 
-    stat, p_value = stats.mannwhitneyu(group1, group2)
-    print(f"✅ Mann-Whitney U Test for {dataset_name} Data: p = {p_value:.5f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
+    print(f"✅ Mann-Whitney U Test{method} for {dataset_name} Data: p = {p_value:.5f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
     return p_value
 
 # Kruskal-Wallis Test (Non-Parametric Alternative)
-def kruskal_wallis(df, categorical_var, target_variable, dataset_name):
+def kruskal_wallis(df, categorical_var, target_variable, dataset_name, permutations=None, seed=None, n_jobs=1):
     """
     Performs Kruskal-Wallis Test for a categorical independent variable.
 
@@ -41,6 +62,10 @@ def kruskal_wallis(df, categorical_var, target_variable, dataset_name):
     categorical_var (str): The independent variable (e.g., "Gender", "Age_Group").
     target_variable (str): The dependent variable (e.g., "Acceptance_Score").
     dataset_name (str): Name of the dataset for printing results.
+    permutations (int): If given, the p-value comes from a Monte-Carlo permutation test of H
+    with this many relabellings instead of the chi-squared approximation.
+    seed (int): Seed of the permutation test.
+    n_jobs (int): Worker processes for the permutation test (0 = one per CPU core).
     """
     # Ensure categorical_var exists
     if categorical_var not in df.columns:
@@ -50,11 +75,32 @@ def kruskal_wallis(df, categorical_var, target_variable, dataset_name):
     if target_variable not in df.columns:
         raise KeyError(f"❌ Column '{target_variable}' not found in {dataset_name} Data!")
 
-    groups = [df[df[categorical_var] == cat][target_variable] for cat in df[categorical_var].unique()]
-    kw_stat, p_value = stats.kruskal(*groups)
-    print(f"✅ Kruskal-Wallis Test for {dataset_name} Data (Factor: {categorical_var}): p = {p_value:.3f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
+    # H from the rows per (group, score); equal to scipy.stats.kruskal on the raw groups
+    kw_stat, p_value = kruskal_from_histogram(value_histogram(df, categorical_var, target_variable))
+    method = ""
+
+    if permutations:
+        data = df[[categorical_var, target_variable]].dropna()
+        result = permutation_test(rank_values(data[target_variable]), data[categorical_var], "kruskal",
+                                  n_permutations=permutations, seed=seed, n_jobs=n_jobs)
+        p_value, method = result["p_value"], f" ({permutation_label(result)})"
+
+    print(f"✅ Kruskal-Wallis Test{method} for {dataset_name} Data (Factor: {categorical_var}): p = {p_value:.3f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
     return p_value
 
+def _wilcoxon_signed_rank(differences):
+    # two-sided signed-rank test with the normal approximation (tie corrected, zeros dropped),
+    # as scipy.stats.wilcoxon uses for more than 50 pairs; |d| is ranked by counting ties
+    nonzero = differences[differences != 0]
+    codes, _, counts = tie_counts(np.abs(nonzero))
+    ranks = midranks(counts)[codes]
+    r_plus, r_minus = ranks[nonzero > 0].sum(), ranks[nonzero < 0].sum()
+    n = len(nonzero)
+    se = np.sqrt((n * (n + 1) * (2 * n + 1) - tie_term(counts) / 2) / 24)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (r_plus - n * (n + 1) / 4) / se
+    return min(r_plus, r_minus), 2 * stats.norm.sf(abs(z))
+
 def wilcoxon_test(df_original, df_perceived, target_variable):
     """
     Performs the Wilcoxon Signed-Rank Test to compare Original vs. Perceived Acceptance Scores.
@@ -71,7 +117,11 @@ def wilcoxon_test(df_original, df_perceived, target_variable):
 
     try:
         # Wilcoxon Signed-Rank Test (Paired Data)
-        stat, p_value = stats.wilcoxon(df_original[target_variable], df_perceived[target_variable])
+        differences = df_original[target_variable].to_numpy(dtype=float) - df_perceived[target_variable].to_numpy(dtype=float)
+        if len(differences) > 50 and not np.isnan(differences).any():
+            stat, p_value = _wilcoxon_signed_rank(differences)
+        else:
+            stat, p_value = stats.wilcoxon(df_original[target_variable], df_perceived[target_variable])
         
         print(f"\nWilcoxon Signed-Rank Test Results:")
         print(f"W = {stat}, p = {p_value:.3f}")
@@ -87,42 +137,154 @@ def wilcoxon_test(df_original, df_perceived, target_variable):
         print("Skipping statistical test due to invalid conditions.")
 
 # Aligned Ranked Transformation test (two way anova alternative)
-def art_anova(df, categorical_vars, target_variable, dataset_name):
+def _deviation_contrasts(n_levels):
+    # sum-to-zero coding: one column per level but the last, which is -1 everywhere
+    return np.vstack([np.eye(n_levels - 1), -np.ones((1, n_levels - 1))])
+
+def art_anova_table(df, categorical_vars, target_variable):
     """
-    Performs Aligned Rank Transformation (ART) ANOVA for non-parametric interaction effects.
+    Computes the Aligned Rank Transform (ART) ANOVA table for every main and interaction effect.
+
+    For each effect the response is aligned (cell residual + estimated effect from the
+    inclusion-exclusion of marginal means), ranked by counting ties, and tested in a full factorial
+    Type III ANOVA (sum-to-zero contrasts) fitted from per-cell counts and rank sums.
 
     Parameters:
-    - df (DataFrame): The dataset (original or perceived).
-    - categorical_vars (list): Independent variables (e.g., ["Gender", "Age group", "Education", ...]).
-    - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
-    - dataset_name (str): Name of the dataset for printing results.
+    df (DataFrame): The dataset (original or perceived).
+    categorical_vars (list): Independent variables (e.g., ["Gender", "Age group"]).
+    target_variable (str): The dependent variable (e.g., "Acceptance_Score").
 
     Returns:
-    - float: p-value for the highest-order interaction effect.
+    DataFrame: One row per effect (e.g. "Gender", "Gender:age group") with sum_sq, df, F,
+    PR(>F) and df_resid.
     """
+    from itertools import combinations
+
+    data = df[list(categorical_vars) + [target_variable]].dropna()
+    y = data[target_variable].to_numpy(dtype=float)
+    n_factors = len(categorical_vars)
+
+    # integer codes per factor, combined into a mixed-radix cell key; levels are sorted by
+    # label rather than category order, because with empty cells the Type III tests depend
+    # on which level the sum-to-zero contrasts leave out
+    codes, levels = [], []
+    for var in categorical_vars:
+        factor_codes, uniques = pd.factorize(data[var].to_numpy(dtype=object), sort=True)
+        codes.append(factor_codes)
+        levels.append(len(uniques))
+
+    effects = [subset for order in range(1, n_factors + 1) for subset in combinations(range(n_factors), order)]
+
+    # non-empty cells of the full factorial design
+    full_key = np.zeros(len(y), dtype=np.int64)
+    for f in range(n_factors):
+        full_key = full_key * levels[f] + codes[f]
+    cell_keys, cell_of_row, cell_counts = np.unique(full_key, return_inverse=True, return_counts=True)
+    cell_codes = np.empty((len(cell_keys), n_factors), dtype=np.int64)
+    remainder = cell_keys.copy()
+    for f in reversed(range(n_factors)):
+        cell_codes[:, f] = remainder % levels[f]
+        remainder //= levels[f]
+    cell_sums = np.bincount(cell_of_row, weights=y, minlength=len(cell_keys))
+
+    def marginal_means(subset):
+        # means over any subset of factors, aggregated from the cells and returned per cell
+        key = np.zeros(len(cell_keys), dtype=np.int64)
+        for f in subset:
+            key = key * levels[f] + cell_codes[:, f]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (np.bincount(key, weights=cell_sums) / np.bincount(key, weights=cell_counts))[key]
+
+    sqrt_weights = np.sqrt(cell_counts)
+    df_resid = len(y) - len(cell_keys)
 
-    # Step 1: Rank Transform the Target Variable
-    df["Ranked_Score"] = stats.rankdata(df[target_variable])
+    # full factorial design on the cells, one column block per effect
+    contrasts = [_deviation_contrasts(n) for n in levels]
+    blocks = {}
+    for effect in effects:
+        block = np.ones((len(cell_keys), 1))
+        for f in effect:
+            block = (block[:, :, None] * contrasts[f][cell_codes[:, f]][:, None, :]).reshape(len(cell_keys), -1)
+        blocks[effect] = block
+    full_design = np.hstack([np.ones((len(cell_keys), 1))] + [blocks[e] for e in effects])
+    columns, start = {}, 1
+    for effect in effects:
+        columns[effect] = np.arange(start, start + blocks[effect].shape[1])
+        start += blocks[effect].shape[1]
 
-    # Step 2: Dynamically Construct ANOVA Formula
-    main_effects = " + ".join([f'C(Q("{var}"))' for var in categorical_vars])
-    interaction_term = ":".join([f'C(Q("{var}"))' for var in categorical_vars])  # Full N-way interaction
+    # least squares on the cell means weighted by cell size equals OLS on the raw rows up
+    # to the within-cell sum of squares, so the design is factored once for all effects;
+    # each Type III sum of squares is then the Wald form b_E' inv(cov_EE) b_E
+    u, singular, vt = np.linalg.svd(full_design * sqrt_weights[:, None], full_matrices=False)
+    keep = singular > singular.max() * max(full_design.shape) * np.finfo(float).eps
+    u, singular, vt = u[:, keep], singular[keep], vt[keep]
+    covariance = (vt.T / singular ** 2) @ vt
+    hypothesis = {}
+    for effect in effects:
+        cov_effect = covariance[np.ix_(columns[effect], columns[effect])]
+        hypothesis[effect] = (np.linalg.pinv(cov_effect, hermitian=True), np.linalg.matrix_rank(cov_effect, hermitian=True))
 
-    # Full ANOVA formula (Main Effects + Highest-Order Interaction)
-    formula = f'Ranked_Score ~ {main_effects} + {interaction_term}'
+    # the aligned response only depends on (cell, score), so ranks are computed on the
+    # distinct (cell, score) pairs weighted by their row counts instead of on every row
+    score_codes, score_levels, _ = tie_counts(y)
+    pair_codes, pair_keys = pd.factorize(cell_of_row * len(score_levels) + score_codes)
+    pair_counts = np.bincount(pair_codes).astype(float)
+    pair_cell = pair_keys // len(score_levels)
+    pair_residuals = score_levels[pair_keys % len(score_levels)] - (cell_sums / cell_counts)[pair_cell]
+    means = {subset: marginal_means(subset) for order in range(n_factors + 1) for subset in combinations(range(n_factors), order)}
+    rows = {}
+    for effect in effects:
+        # estimated effect = alternating sum of the marginal means of every sub-effect
+        estimate = np.zeros(len(cell_keys))
+        for order in range(len(effect) + 1):
+            for subset in combinations(effect, order):
+                estimate += (-1) ** (len(effect) - order) * means[subset]
+        pair_ranks = rank_values(pair_residuals + estimate[pair_cell], weights=pair_counts)
 
-    # Step 3: Fit ANOVA Model Using Ranked Data
-    model = smf.ols(formula, data=df).fit()
-    anova_table = sm.stats.anova_lm(model, typ=2)
+        cell_rank_sums = np.bincount(pair_cell, weights=pair_counts * pair_ranks, minlength=len(cell_keys))
+        cell_rank_means = cell_rank_sums / cell_counts
+        ss_within = float((pair_counts * pair_ranks ** 2).sum() - (cell_rank_sums ** 2 / cell_counts).sum())
 
-    # Print Full ANOVA Table
+        weighted_means = cell_rank_means * sqrt_weights
+        coefficients = (vt.T / singular) @ (u.T @ weighted_means)
+        rss_full = float(weighted_means @ weighted_means - ((u.T @ weighted_means) ** 2).sum())
+        inv_cov_effect, df_effect = hypothesis[effect]
+        effect_coefficients = coefficients[columns[effect]]
+        sum_sq = float(effect_coefficients @ inv_cov_effect @ effect_coefficients)
+        ss_resid = ss_within + max(rss_full, 0.0)
+
+        if df_effect > 0 and df_resid > 0 and ss_resid > 0:
+            f_stat = (sum_sq / df_effect) / (ss_resid / df_resid)
+            p_value = stats.f.sf(f_stat, df_effect, df_resid)
+        else:
+            f_stat, p_value = np.nan, np.nan
+        rows[":".join(categorical_vars[f] for f in effect)] = (sum_sq, df_effect, f_stat, p_value, df_resid)
+
+    return pd.DataFrame.from_dict(rows, orient="index", columns=["sum_sq", "df", "F", "PR(>F)", "df_resid"])
+
+@cached_result()
+def art_anova(df, categorical_vars, target_variable, dataset_name):
+    """
+    Performs Aligned Rank Transformation (ART) ANOVA for non-parametric interaction effects.
+
+    Parameters:
+    df (DataFrame): The dataset (original or perceived).
+    categorical_vars (list): Independent variables (e.g., ["Gender", "Age group", "Education", ...]).
+    target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+    dataset_name (str): Name of the dataset for printing results.
+
+    Returns:
+    float: p-value for the highest-order interaction effect.
+    """
+    anova_table = art_anova_table(df, categorical_vars, target_variable)
+
+    # Print Full ANOVA Table (every main and interaction effect)
     print(f"\n✅ ART ANOVA (Non-Parametric Interaction Test) Results for {dataset_name}:\n", anova_table)
 
-    # Step 4: Extract and return the p-value for the highest-order interaction
-    try:
-        interaction_p_value = float(anova_table.loc[interaction_term, "PR(>F)"])
-    except KeyError:
-        print("\n❌ Error: Interaction term not found in ANOVA table. Returning NaN.")
-        interaction_p_value = np.nan  # Return NaN if the interaction effect is missing
+    # Extract and return the p-value for the highest-order interaction
+    interaction_term = ":".join(categorical_vars)
+    interaction_p_value = float(anova_table.loc[interaction_term, "PR(>F)"])
+    if np.isnan(interaction_p_value):
+        print("\n❌ Error: Interaction term could not be estimated. Returning NaN.")
 
-    return interaction_p_value
\ No newline at end of file
+    return interaction_p_value
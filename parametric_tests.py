@@ -1,12 +1,12 @@
-
-import statsmodels.api as sm
-import statsmodels.formula.api as smf
-import pingouin as pg
 import scipy.stats as stats
 
+from accumulators import cell_moments, one_way_anova_from_moments, two_way_anova_from_moments
+from permutation_tests import permutation_label, permutation_test
+from result_cache import cached_result
+
 
 #t-test - two sample 
-def ind_t_test(df, categorical_var, target_variable, dataset_name):
+def ind_t_test(df, categorical_var, target_variable, dataset_name, permutations=None, seed=None, n_jobs=1):
     """
     Performs an Independent t-test for a categorical variable with two groups.
 
@@ -15,6 +15,10 @@ def ind_t_test(df, categorical_var, target_variable, dataset_name):
     - categorical_var (str): The independent variable (e.g., "Gender").
     - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
     - dataset_name (str): Name of the dataset for printing results.
+    - permutations (int): If given, the p-value comes from a permutation test of the t statistic
+      with this many relabellings (exact when fewer relabellings exist) instead of the t distribution.
+    - seed (int): Seed of the permutation test.
+    - n_jobs (int): Worker processes for the permutation test (0 = one per CPU core).
 
     Returns:
     - float: p-value of the t-test.
@@ -47,8 +51,14 @@ def ind_t_test(df, categorical_var, target_variable, dataset_name):
 
     # Perform Independent t-test
     t_stat, p_value = stats.ttest_ind(group1, group2, equal_var=equal_var)
+    method = ""
+
+    if permutations:
+        result = permutation_test(df[target_variable], df[categorical_var], "t", equal_var=equal_var,
+                                  n_permutations=permutations, seed=seed, n_jobs=n_jobs)
+        p_value, method = result["p_value"], f" ({permutation_label(result)})"
 
-    print(f"✅ Independent t-test for {dataset_name} Data (Factor: {categorical_var}): p = {p_value:.5f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
+    print(f"✅ Independent t-test{method} for {dataset_name} Data (Factor: {categorical_var}): p = {p_value:.5f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
 
     return p_value
 
@@ -57,6 +67,9 @@ def one_way_anova(df, categorical_var, target_variable, dataset_name):
     """
     Performs One-Way ANOVA for a categorical independent variable.
 
+    The F-test is computed in closed form from per-group count / mean / M2 moments
+    (see accumulators.py); it gives the same F and p as an OLS fit with anova_lm.
+
     Parameters:
     - df (DataFrame): The dataset (original or perceived).
     - categorical_var (str): The independent variable (e.g., "Gender", "Age_Group").
@@ -66,22 +79,20 @@ def one_way_anova(df, categorical_var, target_variable, dataset_name):
     Returns:
     - float: p-value of the ANOVA test.
     """
-    model = smf.ols(f"{target_variable} ~ C(Q('{categorical_var}'))", data=df).fit()
-    anova_table = sm.stats.anova_lm(model, typ=2)
-    p_value = anova_table["PR(>F)"].iloc[0] # p-value for the main factor
-    # print(f"✅ One-Way ANOVA Results for {dataset_name} Data (Factor: {categorical_var}):\n", anova_table)
+    anova = one_way_anova_from_moments(cell_moments(df, categorical_var, target_variable))
+    p_value = anova["p_value"]
+    # print(f"✅ One-Way ANOVA Results for {dataset_name} Data (Factor: {categorical_var}):\n", anova)
     print(f"✅ One-Way ANOVA for {dataset_name} Data (Factor: {categorical_var}): p = {p_value:.3f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
 
-    # Extract p-value
-
     # Compute Effect Size (Eta Squared)
-    # eta_squared = anova_table["sum_sq"][0] / anova_table["sum_sq"].sum()
+    # eta_squared = anova["sum_sq_between"] / (anova["sum_sq_between"] + anova["sum_sq_within"])
     # print(f"Effect Size (η²) for {dataset_name} ({categorical_var}): {eta_squared:.3f} "
     #       f"(Small: 0.01, Medium: 0.06, Large: 0.14)")
 
     return p_value
 
 # Two-Way ANOVA
+@cached_result()
 def two_way_anova(df, categorical_vars, target_variable, dataset_name):
     """
     Performs Two-Way ANOVA for multiple categorical independent variables.
@@ -99,11 +110,10 @@ def two_way_anova(df, categorical_vars, target_variable, dataset_name):
     for var in categorical_vars:
         df[var] = df[var].astype("category")
 
-    # Define ANOVA formula with Treatment contrast (to avoid multicollinearity)
-    formula = f'Q("{target_variable}") ~ C(Q("{categorical_vars[0]}"), Treatment) + C(Q("{categorical_vars[1]}"), Treatment) + C(Q("{categorical_vars[0]}"), Treatment):C(Q("{categorical_vars[1]}"), Treatment)'
-
-    model = smf.ols(formula, data=df).fit()
-    anova_table = sm.stats.anova_lm(model, typ=2)
+    # Type II sums of squares from per-cell moments, same table as OLS + anova_lm(typ=2)
+    anova_table = two_way_anova_from_moments(cell_moments(df, categorical_vars[:2], target_variable))
+    terms = [f'C(Q("{var}"), Treatment)' for var in categorical_vars[:2]]
+    anova_table.index = terms + [":".join(terms), "Residual"]
 
     print(f"\n✅ Two-Way ANOVA Results for {dataset_name} Data:\n", anova_table)
 
@@ -133,6 +143,8 @@ def two_way_anova(df, categorical_vars, target_variable, dataset_name):
 
 # two way mixed anova
 def two_way_mixed_anova(df_original, df_perceived, categorical_var, target_variable="Acceptance_Score"):
+    import pingouin as pg
+
     print(f"\nPerforming Two-Way Mixed ANOVA (Comparing Original vs. Perceived Data with {categorical_var})...")
 
     # Identify participant column names in both datasets
@@ -184,6 +196,8 @@ def n_way_anova(df, categorical_vars, target_variable, dataset_name):
     Returns:
     - dict: Dictionary of p-values for main effects & highest-order interaction effect.
     """
+    import statsmodels.api as sm
+    import statsmodels.formula.api as smf
 
     # Construct categorical main effect terms
     categorical_terms = " + ".join([f'C(Q("{var}"))' for var in categorical_vars])
@@ -0,0 +1,148 @@
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# statistics the permutation engine knows how to recompute from per-group sums
+STATISTICS = ("t", "rank_sum", "kruskal")
+
+# permutations evaluated per batch; the label matrix is chunk_size x n integers
+CHUNK_SIZE = 2000
+
+# element budget of the label matrix of one batch; large samples get fewer relabellings per
+# batch, so memory stays bounded however many observations there are
+MAX_BATCH_ELEMENTS = 4_000_000
+
+
+def _group_sums(values, labels, n_groups):
+    # per-row group sums of `values` for a (rows, n) matrix of group labels; the row index
+    # broadcasts against the labels, so no (rows, n) copy of the values is built
+    sums = np.zeros((len(labels), n_groups))
+    np.add.at(sums, (np.arange(len(labels))[:, None], labels), values)
+    return sums
+
+
+def _statistic(values, labels, counts, statistic, equal_var):
+    """
+    Computes the test statistic for every row of a (rows, n) label matrix.
+
+    Larger values are more extreme, so the two-sided p-value is the share of rows
+    at least as large as the observed one.
+    """
+    n_groups = len(counts)
+    sums = _group_sums(values, labels, n_groups)
+
+    if statistic == "t":
+        sums_sq = _group_sums(values ** 2, labels, n_groups)
+        means = sums / counts
+        variances = (sums_sq - sums * means) / (counts - 1)
+        if equal_var:
+            pooled = ((counts - 1) * variances).sum(axis=1) / (counts.sum() - 2)
+            se = np.sqrt(pooled * (1 / counts[0] + 1 / counts[1]))
+        else:
+            se = np.sqrt((variances / counts).sum(axis=1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.abs(means[:, 0] - means[:, 1]) / se
+
+    n = counts.sum()
+    if statistic == "rank_sum":
+        # |R1 - E[R1]| orders the permutations like the two-sided Mann-Whitney U
+        return np.abs(sums[:, 0] - counts[0] * (n + 1) / 2)
+
+    # Kruskal-Wallis H; the tie correction is the same for every permutation
+    return 12 / (n * (n + 1)) * (sums ** 2 / counts).sum(axis=1) - 3 * (n + 1)
+
+
+def _random_chunk(values, labels, counts, statistic, equal_var, size, seed):
+    rng = np.random.default_rng(seed)
+    shuffled = np.tile(labels, (size, 1))
+    rng.permuted(shuffled, axis=1, out=shuffled)
+    return _statistic(values, shuffled, counts, statistic, equal_var)
+
+
+def _exact_chunks(n, n_first, chunk_size):
+    # every split of n observations into a first group of n_first and the rest, as label rows
+    combinations = itertools.combinations(range(n), n_first)
+    while True:
+        members = np.fromiter(itertools.chain.from_iterable(itertools.islice(combinations, chunk_size)),
+                              dtype=np.intp)
+        if members.size == 0:
+            return
+        members = members.reshape(-1, n_first)
+        labels = np.ones((len(members), n), dtype=np.intp)
+        np.put_along_axis(labels, members, 0, axis=1)
+        yield labels
+
+
+# Permutation test for a difference between groups
+def permutation_test(values, groups, statistic="t", equal_var=False, n_permutations=9999,
+                     chunk_size=CHUNK_SIZE, seed=None, n_jobs=1):
+    """
+    Computes a permutation p-value for a difference between groups.
+
+    Two groups are tested exactly when every relabelling fits in `n_permutations`;
+    otherwise (and for more than two groups) `n_permutations` random relabellings are
+    drawn in batches of at most `chunk_size` rows and MAX_BATCH_ELEMENTS labels, each
+    batch scored at once with NumPy. Every batch gets its own child of the seed, so a
+    seeded result is the same for any n_jobs.
+
+    Parameters:
+    - values (array): Observations (e.g. Acceptance_Score); ranks for "rank_sum" and "kruskal".
+    - groups (array): Group label of each observation.
+    - statistic (str): "t" (two groups), "rank_sum" (two groups, Mann-Whitney) or "kruskal".
+    - equal_var (bool): Pooled instead of Welch standard error for "t".
+    - n_permutations (int): Random relabellings to draw, and the exact enumeration limit.
+    - chunk_size (int): Relabellings scored per batch at most (see MAX_BATCH_ELEMENTS).
+    - seed (int): Seed for reproducible random relabellings.
+    - n_jobs (int): Worker processes for the random batches (0 = one per CPU core).
+
+    Returns:
+    - dict: statistic (observed), p_value, n_permutations (evaluated) and exact (bool).
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"❌ Unknown permutation statistic '{statistic}', expected one of {STATISTICS}.")
+
+    values = np.asarray(values, dtype=float)
+    group_names, labels = np.unique(np.asarray(groups), return_inverse=True)
+    counts = np.bincount(labels).astype(float)
+    if statistic in ("t", "rank_sum") and len(group_names) != 2:
+        raise ValueError(f"❌ The '{statistic}' permutation statistic needs exactly 2 groups, got {len(group_names)}.")
+
+    chunk_size = max(1, min(chunk_size, MAX_BATCH_ELEMENTS // max(len(values), 1)))
+    observed = _statistic(values, labels[None, :], counts, statistic, equal_var)[0]
+    # tolerate floating point noise when counting relabellings as extreme as the observed one
+    threshold = observed - 1e-9 * max(abs(observed), 1.0)
+
+    if len(group_names) == 2 and math.comb(len(values), int(counts[0])) <= n_permutations:
+        extreme = total = 0
+        for chunk in _exact_chunks(len(values), int(counts[0]), chunk_size):
+            permuted = _statistic(values, chunk, counts, statistic, equal_var)
+            extreme += int((permuted >= threshold).sum())
+            total += len(chunk)
+        return {"statistic": observed, "p_value": extreme / total, "n_permutations": total, "exact": True}
+
+    sizes = [chunk_size] * (n_permutations // chunk_size)
+    if n_permutations % chunk_size:
+        sizes.append(n_permutations % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(values, labels, counts, statistic, equal_var, size, s) for size, s in zip(sizes, seeds)]
+
+    max_workers = n_jobs or os.cpu_count() or 1
+    if max_workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            chunks = list(pool.map(_random_chunk, *zip(*jobs)))
+    else:
+        chunks = [_random_chunk(*job) for job in jobs]
+
+    extreme = sum(int((permuted >= threshold).sum()) for permuted in chunks)
+    # the observed labelling counts as one of the relabellings (Phipson & Smyth)
+    p_value = (extreme + 1) / (n_permutations + 1)
+    return {"statistic": observed, "p_value": p_value, "n_permutations": n_permutations, "exact": False}
+
+
+def permutation_label(result):
+    # short description of how a permutation p-value was obtained, for the printed results
+    kind = "exact" if result["exact"] else "Monte-Carlo"
+    return f"{kind} permutation, {result['n_permutations']} relabellings"
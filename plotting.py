@@ -0,0 +1,102 @@
+import contextlib
+import importlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import finish_figure, use_batch_rendering
+
+# Plot jobs as small serialisable specs.
+#
+# A plot helper computes its summary table (describe_groups, cell means and CIs, ...) next
+# to the statistics and submits a spec naming a module-level draw function, the PNG path,
+# and the table plus styling arguments. Outside collect_plots() the spec is drawn at once,
+# as before; inside it the specs are only gathered, so the caller can render them on a
+# process pool while the statistics of the next analysis run.
+
+# specs gathered by collect_plots(); None draws every plot as soon as it is submitted
+_collected = None
+
+
+# Describe a plot job by its draw function, output path and arguments
+def plot_spec(draw, file_name, *args, **kwargs):
+    """
+    Builds a picklable description of one plot.
+
+    Parameters:
+    - draw (function): Module-level function returning a matplotlib Figure for *args, **kwargs.
+    - file_name (str): Path of the PNG (e.g., "plot/original_gender_mean_median_error_plot.png").
+    - args, kwargs: Precomputed summary tables and styling (DataFrames, dicts, lists, strings).
+
+    Returns:
+    - dict: {"draw": (module name, function name), "file_name", "args", "kwargs"}
+    """
+    return {"draw": (draw.__module__, draw.__name__), "file_name": file_name, "args": args, "kwargs": kwargs}
+
+
+# Draw and save one plot spec in this process
+def render_plot(spec):
+    module_name, function_name = spec["draw"]
+    draw = getattr(importlib.import_module(module_name), function_name)
+    finish_figure(draw(*spec["args"], **spec["kwargs"]), spec["file_name"])
+
+
+def render_plot_captured(spec):
+    # keep the output of every plot together so the caller can print it in submission order
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        render_plot(spec)
+    return output.getvalue()
+
+
+# Draw a plot now, or queue it when plots are being collected
+def submit_plot(draw, file_name, *args, **kwargs):
+    spec = plot_spec(draw, file_name, *args, **kwargs)
+    if _collected is None:
+        render_plot(spec)
+    else:
+        _collected.append(spec)
+
+
+# Gather the plots submitted inside a with block instead of drawing them
+@contextlib.contextmanager
+def collect_plots():
+    """
+    Context manager yielding the list the plot specs submitted inside it are appended to.
+    """
+    global _collected
+    previous, _collected = _collected, []
+    try:
+        yield _collected
+    finally:
+        _collected = previous
+
+
+# Process pool for rendering plot specs
+def plot_pool(max_workers=None):
+    """
+    Starts a process pool whose workers render headless with the Agg backend.
+
+    Parameters:
+    - max_workers (int): Worker processes (None = one per CPU core).
+
+    Returns:
+    - ProcessPoolExecutor: Submit render_plot_captured(spec) to it.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers or os.cpu_count() or 1, initializer=use_batch_rendering)
+
+
+# Render plot specs concurrently and print their output in order
+def render_plots(specs, max_workers=None):
+    """
+    Renders plot specs on a process pool.
+
+    Parameters:
+    - specs (list): Specs from collect_plots() or plot_spec().
+    - max_workers (int): Worker processes (None = one per CPU core).
+    """
+    if not specs:
+        return
+    with plot_pool(min(max_workers or os.cpu_count() or 1, len(specs))) as pool:
+        for output in pool.map(render_plot_captured, specs):
+            print(output, end="")
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+# Rank engine for variables with few distinct values.
+#
+# The Acceptance_Score is the mean of four 1-7 ratings on a 0-100 scale, so it only takes
+# 25 distinct values (and U / EOU even fewer). Instead of sorting all n observations like
+# scipy.stats.rankdata, the values are hashed to the distinct values (O(n)), only those k
+# values are sorted, and the average rank (midrank) of every value and the tie correction
+# follow from the per-value counts. Ranking n rows costs O(n + k log k).
+
+
+# Distinct values of an array with the number of observations of each
+def tie_counts(values, weights=None):
+    """
+    Counts the observations of every distinct value.
+
+    Parameters:
+    - values (array): Observations without missing values.
+    - weights (array): Number of observations each entry stands for (e.g. a histogram); 1 if None.
+
+    Returns:
+    - tuple: (codes, levels, counts) where levels are the sorted distinct values, codes the
+      position of every entry in levels and counts the observations per level.
+    """
+    codes, uniques = pd.factorize(np.asarray(values))
+    order = np.argsort(uniques, kind="stable")
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+    codes = position[codes]
+    counts = np.bincount(codes, weights=weights, minlength=len(uniques))
+    return codes, np.asarray(uniques)[order], counts
+
+
+# average rank of every level from the number of observations per sorted level
+def midranks(counts):
+    counts = np.asarray(counts, dtype=float)
+    return np.cumsum(counts) - (counts - 1) / 2
+
+
+# sum of t^3 - t over the tie counts, used by the tie corrections of rank tests
+def tie_term(counts):
+    counts = np.asarray(counts, dtype=float)
+    return float((counts ** 3 - counts).sum())
+
+
+# Average ranks of an array, like scipy.stats.rankdata(values)
+def rank_values(values, weights=None):
+    """
+    Ranks observations, giving tied values their average rank.
+
+    Parameters:
+    - values (array): Observations without missing values.
+    - weights (array): Number of observations each entry stands for; 1 if None.
+
+    Returns:
+    - array: Rank of every entry; equal to scipy.stats.rankdata when weights is None.
+    """
+    codes, _, counts = tie_counts(values, weights)
+    return midranks(counts)[codes]
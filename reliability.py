@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from accumulators import alpha_if_deleted_from_moments, cronbach_alpha_from_moments, item_moments, merge_item_moments
+from bootstrap import confidence_limits
+from streaming import CHUNK_SIZE, iter_chunks
+from utils import report_reliability, reliability_vars
+
+# Reliability engine on a mergeable item covariance accumulator.
+#
+# Cronbach's alpha and alpha-if-item-deleted are closed-form functions of the item
+# covariance matrix (accumulators.py), so a dataset is reduced to a count, a mean vector
+# and a co-moment matrix per chunk and the chunks are merged. The bootstrap uses Poisson
+# weights: every row enters replicate b with a Poisson(1) weight, which resamples like
+# drawing n rows with replacement but needs no second pass, so the replicates are
+# accumulated chunk by chunk next to the point estimate, as one weighted co-moment matrix
+# per replicate. Weights are drawn row by row, so the result does not depend on how the
+# rows are split into chunks.
+
+# bootstrap replicates kept by a reliability accumulator
+N_RESAMPLES = 1000
+
+# rows weighted per batch; the weight matrix is n_resamples x BLOCK_SIZE
+BLOCK_SIZE = 2000
+
+
+def _weighted_item_moments(items, weights, columns):
+    # count, mean and co-moment of the rows for every row of weights (replicates x rows)
+    shift = items.mean(axis=0)  # centred first, so the raw cross products do not cancel
+    centred = items - shift
+    count = weights.sum(axis=1)
+    products = weights @ (centred[:, :, None] * centred[:, None, :]).reshape(len(items), -1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count[:, None] > 0, (weights @ centred) / count[:, None], 0.0)
+    comoment = products.reshape(len(weights), len(columns), len(columns)) - count[:, None, None] * mean[:, :, None] * mean[:, None, :]
+    return {"columns": list(columns), "count": count, "mean": mean + shift, "comoment": comoment}
+
+
+# Empty reliability accumulator
+def new_reliability_moments(columns=reliability_vars, n_resamples=N_RESAMPLES, seed=None):
+    """
+    Parameters:
+    - columns (list): Items of the scale.
+    - n_resamples (int): Bootstrap replicates (0 for none).
+    - seed (int or Generator): Seed or NumPy random generator of the Poisson weights.
+
+    Returns:
+    - dict: {"items": item moments, "replicates": item moments with one entry per replicate, "rng": Generator}
+    """
+    k = len(columns)
+    return {
+        "items": {"columns": list(columns), "count": 0, "mean": np.zeros(k), "comoment": np.zeros((k, k))},
+        "replicates": {"columns": list(columns), "count": np.zeros(n_resamples), "mean": np.zeros((n_resamples, k)),
+                       "comoment": np.zeros((n_resamples, k, k))},
+        "rng": np.random.default_rng(seed),
+    }
+
+
+# Fold the rows of a chunk into a reliability accumulator
+def update_reliability_moments(moments, df, block_size=BLOCK_SIZE):
+    """
+    Updates a reliability accumulator in place with the complete rows of `df` (rows with a
+    missing item are left out) and returns it.
+    """
+    columns = moments["items"]["columns"]
+    moments["items"] = merge_item_moments(moments["items"], item_moments(df, columns))
+    items = df[columns].dropna().to_numpy(dtype=float)
+    n_resamples = len(moments["replicates"]["count"])
+    for start in range(0, len(items) if n_resamples else 0, block_size):
+        block = items[start:start + block_size]
+        weights = moments["rng"].poisson(1.0, size=(len(block), n_resamples)).T.astype(float)
+        moments["replicates"] = merge_item_moments(moments["replicates"], _weighted_item_moments(block, weights, columns))
+    return moments
+
+
+# Alpha, bootstrap CIs and alpha-if-item-deleted from a reliability accumulator
+def reliability_from_moments(moments, confidence=0.95):
+    """
+    Computes Cronbach's alpha and alpha without each item with percentile bootstrap CIs,
+    all from the covariance matrices of the accumulator in one vectorized pass.
+
+    Parameters:
+    - moments (dict): Reliability accumulator (new_reliability_moments / update_reliability_moments).
+    - confidence (float): Confidence level of the intervals.
+
+    Returns:
+    - DataFrame: Indexed by "All items" and then every item, with n, alpha, ci_low and ci_high
+      (the item rows give alpha if that item is deleted).
+    """
+    columns = moments["items"]["columns"]
+    estimates = np.concatenate([[cronbach_alpha_from_moments(moments["items"])], alpha_if_deleted_from_moments(moments["items"])])
+    replicates = moments["replicates"]
+    ci_low = ci_high = np.full(len(estimates), np.nan)
+    if len(replicates["count"]):
+        values = np.column_stack([cronbach_alpha_from_moments(replicates), alpha_if_deleted_from_moments(replicates)])
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values):
+            ci_low, ci_high = confidence_limits(values, estimates, confidence=confidence)
+    return pd.DataFrame({"n": moments["items"]["count"], "alpha": estimates, "ci_low": ci_low, "ci_high": ci_high},
+                        index=pd.Index(["All items"] + columns, name="item"))
+
+
+# Reliability of a DataFrame
+def reliability_analysis(df, columns=reliability_vars, n_resamples=N_RESAMPLES, confidence=0.95, seed=None):
+    """
+    Cronbach's alpha with a bootstrap CI and alpha-if-item-deleted of an in-memory dataset.
+
+    Returns:
+    - DataFrame: See reliability_from_moments.
+    """
+    moments = update_reliability_moments(new_reliability_moments(columns, n_resamples, seed), df)
+    return reliability_from_moments(moments, confidence)
+
+
+# Reliability of a CSV or Parquet export read in chunks
+def stream_reliability(file_path, columns=reliability_vars, n_resamples=N_RESAMPLES, confidence=0.95, seed=None,
+                       chunksize=CHUNK_SIZE):
+    """
+    Like reliability_analysis, but reads only the item columns of an export chunk by chunk,
+    so memory is bounded by one chunk plus the accumulator.
+
+    Returns:
+    - DataFrame: See reliability_from_moments.
+    """
+    moments = new_reliability_moments(columns, n_resamples, seed)
+    for chunk in iter_chunks(file_path, columns=columns, chunksize=chunksize):
+        update_reliability_moments(moments, chunk)
+    return reliability_from_moments(moments, confidence)
+
+
+# Print a reliability table
+def report_reliability_table(table, dataset_name, confidence=0.95):
+    overall = table.iloc[0]
+    report_reliability(overall["alpha"], dataset_name)
+    print(f"🔹 {confidence:.0%} bootstrap CI of Cronbach's Alpha: [{overall['ci_low']:.3f}, {overall['ci_high']:.3f}]")
+    for item, row in table.iloc[1:].iterrows():
+        print(f"🔹 Alpha if '{item}' is deleted: {row['alpha']:.3f} [{row['ci_low']:.3f}, {row['ci_high']:.3f}]")
@@ -0,0 +1,181 @@
+import contextlib
+import functools
+import glob
+import hashlib
+import inspect
+import io
+import os
+import pickle
+import sys
+from importlib import metadata
+
+import pandas as pd
+
+# On-disk memoization of test results.
+#
+# A cached function's entry is keyed by the function, a hash of only the DataFrame columns
+# it reads, its other arguments, the versions of the statistics libraries and the source of
+# this project, so an entry is reused exactly when the same test would see the same inputs.
+# The result is stored with everything the function printed, and a hit prints that output
+# again, so a cached run reads like a computed one. Files are evicted least recently used
+# first once the cache grows beyond MAX_CACHE_BYTES. Set RESULT_CACHE=0 to disable it.
+
+# next to the project's modules, like the workbook cache of utils.load_data, so runs from any
+# working directory share one cache
+RESULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "results")
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# libraries whose version is part of every key
+LIBRARIES = ("numpy", "pandas", "scipy", "pingouin", "scikit-posthocs")
+
+# versions and source digest, computed once per process
+_environment = None
+
+
+def _environment_digest():
+    global _environment
+    if _environment is None:
+        digest = hashlib.sha256()
+        for library in LIBRARIES:
+            try:
+                digest.update(f"{library}={metadata.version(library)};".encode())
+            except metadata.PackageNotFoundError:
+                digest.update(f"{library}=;".encode())
+        # any edit to the project's code invalidates the results computed by the old code
+        for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        _environment = digest.digest()
+    return _environment
+
+
+def _named_columns(arguments):
+    # strings among the arguments (and inside list/tuple arguments), in order, without repeats
+    names = []
+    for value in arguments.values():
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            if isinstance(item, str):
+                names.append(item)
+    return list(dict.fromkeys(names))
+
+
+def _result_key(function, arguments, columns):
+    digest = hashlib.sha256(_environment_digest())
+    digest.update(f"{inspect.getsourcefile(function)}:{function.__qualname__}".encode())
+    named = list(dict.fromkeys(columns)) if columns is not None else _named_columns(arguments)
+    for name, value in arguments.items():
+        digest.update(f"\x1e{name}=".encode())
+        if isinstance(value, pd.DataFrame):
+            # only the columns the test reads, so unrelated columns can change freely
+            used = [column for column in named if column in value.columns] or list(value.columns)
+            digest.update(repr(used).encode())
+            digest.update(pd.util.hash_pandas_object(value[used], index=False).values.tobytes())
+        elif isinstance(value, pd.Series):
+            digest.update(pd.util.hash_pandas_object(value, index=False).values.tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _load(path):
+    try:
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None  # unreadable entry, recomputed and overwritten
+    with contextlib.suppress(OSError):
+        os.utime(path)  # mark as recently used
+    return entry
+
+
+def _store(path, entry):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+        print(f"⚠️ Could not cache result in '{path}': {e}")
+        return
+    evict_results()
+
+
+# Remove least recently used results until the cache fits in max_bytes
+def evict_results(max_bytes=MAX_CACHE_BYTES, cache_dir=RESULT_CACHE_DIR):
+    """
+    Deletes cached results, least recently used first, until their total size is at
+    most `max_bytes` (0 empties the cache).
+
+    Returns:
+    - int: Number of files removed.
+    """
+    entries = []
+    for path in glob.glob(os.path.join(cache_dir, "*.pkl")):
+        with contextlib.suppress(OSError):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(OSError):
+            os.remove(path)
+            removed += 1
+        total -= size
+    return removed
+
+
+class _Tee(io.StringIO):
+    # keeps a copy of everything written while still passing it on to the real stream
+    def __init__(self, stream):
+        super().__init__()
+        self._stream = stream
+
+    def write(self, text):
+        self._stream.write(text)
+        return super().write(text)
+
+
+# Decorator caching a test's result and printed output on disk
+def cached_result(columns=None):
+    """
+    Memoizes a function on disk, keyed by its inputs (see the notes at the top of this module).
+
+    Parameters:
+    - columns (list): Columns a DataFrame argument is read through. If None, the columns
+      named by the other arguments (e.g. categorical_vars and target_variable) are used,
+      and the whole frame when none of them is a column.
+
+    Returns:
+    - function: Decorator.
+    """
+    def decorate(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if os.environ.get("RESULT_CACHE", "1") == "0":
+                return function(*args, **kwargs)
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            path = os.path.join(RESULT_CACHE_DIR, f"{_result_key(function, bound.arguments, columns)}.pkl")
+            entry = _load(path)
+            if entry is not None:
+                result, output = entry
+                print(output, end="")
+                return result
+
+            output = _Tee(sys.stdout)
+            with contextlib.redirect_stdout(output):
+                result = function(*args, **kwargs)
+            _store(path, (result, output.getvalue()))
+            return result
+
+        return wrapper
+
+    return decorate
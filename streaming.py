@@ -0,0 +1,131 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from accumulators import cell_moments, merge_histograms, merge_moments, one_way_anova_from_moments, value_histogram
+from utils import CATEGORICAL_COLUMNS, CATEGORY_LEVELS, add_acceptance_score, normalize_frame, reliability_vars
+
+# rows read per chunk; memory is bounded by one chunk plus the accumulators
+CHUNK_SIZE = 100_000
+
+def _normalize_chunk(chunk):
+    # like a loaded sheet, but every chunk keeps all declared levels as categories, so the
+    # accumulators of different chunks share one categorical index and merge in level order
+    chunk = normalize_frame(chunk)
+    for column, declared in CATEGORY_LEVELS.items():
+        if column in chunk.columns:
+            categories = chunk[column].cat.categories
+            chunk[column] = chunk[column].cat.set_categories(declared + [level for level in categories if level not in declared])
+    return chunk
+
+
+# Read a CSV or Parquet export in chunks of rows
+def iter_chunks(file_path, columns=None, chunksize=CHUNK_SIZE):
+    """
+    Yields DataFrames of at most `chunksize` rows, each cleaned by normalize_frame like a
+    loaded sheet (stripped column names, Categorical factor columns).
+
+    Parameters:
+    - file_path (str): Path of a .csv or .parquet export with the workbook's columns.
+    - columns (list): Columns to read (after stripping); all columns if None.
+    - chunksize (int): Rows per chunk.
+    """
+    wanted = None if columns is None else set(columns)
+    ext = os.path.splitext(file_path)[1].lower()
+
+    if ext == ".csv":
+        usecols = None if wanted is None else (lambda name: name.strip() in wanted)
+        for chunk in pd.read_csv(file_path, usecols=usecols, chunksize=chunksize):
+            yield _normalize_chunk(chunk)
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        names = [name for name in parquet_file.schema_arrow.names if wanted is None or name.strip() in wanted]
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=names):
+            chunk = batch.to_pandas()
+            yield _normalize_chunk(chunk)
+    else:
+        raise ValueError(f"❌ Cannot stream '{file_path}': use a .csv or .parquet export (the workbook is read by load_data).")
+
+
+def _histogram_quantile(histogram, q):
+    # quantile of one category's value -> count histogram, interpolated like np.percentile
+    values = histogram.index.to_numpy(dtype=float)
+    cumulative = np.cumsum(histogram.to_numpy())
+    position = q * (cumulative[-1] - 1)
+    below = values[np.searchsorted(cumulative, np.floor(position), side="right")]
+    above = values[np.searchsorted(cumulative, np.ceil(position), side="right")]
+    return below + (above - below) * (position - np.floor(position))
+
+
+# Stream a CSV or Parquet export into per-factor accumulators
+def stream_accumulators(file_path, factors=CATEGORICAL_COLUMNS, target_variable="Acceptance_Score", chunksize=CHUNK_SIZE):
+    """
+    Reads an export in chunks, computes U, EOU and Acceptance_Score per chunk and
+    updates mergeable accumulators for every factor. Only the rating and factor
+    columns are read, and no chunk is kept once it has been folded in.
+
+    Parameters:
+    - file_path (str): Path of a .csv or .parquet export with the workbook's columns.
+    - factors (list): Categorical variables to summarise (e.g., ["Gender", "age group"]).
+    - target_variable (str): "Acceptance_Score", "U" or "EOU".
+    - chunksize (int): Rows per chunk.
+
+    Returns:
+    - dict: {factor: {"moments": DataFrame, "histogram": Series}}, see accumulators.py.
+    """
+    accumulators = {}
+    for chunk in iter_chunks(file_path, columns=list(factors) + reliability_vars, chunksize=chunksize):
+        add_acceptance_score(chunk)
+        fold_chunk(accumulators, chunk, factors, target_variable)
+    return accumulators
+
+
+# Fold the rows of one scored chunk into per-factor accumulators
+def fold_chunk(accumulators, chunk, factors, target_variable="Acceptance_Score"):
+    """
+    Updates {factor: {"moments", "histogram"}} accumulators in place with the rows of a
+    chunk that already has its target column (see utils.add_acceptance_score).
+    """
+    for factor in factors:
+        moments = cell_moments(chunk, factor, target_variable)
+        histogram = value_histogram(chunk, factor, target_variable)
+        if factor in accumulators:
+            moments = merge_moments(accumulators[factor]["moments"], moments)
+            histogram = merge_histograms(accumulators[factor]["histogram"], histogram)
+        accumulators[factor] = {"moments": moments, "histogram": histogram}
+    return accumulators
+
+
+# Summaries and one-way ANOVA from merged accumulators
+def summarize_accumulators(accumulators, dataset_name=None):
+    """
+    Turns per-factor accumulators into summary statistics and one-way ANOVA results.
+
+    Parameters:
+    - accumulators (dict): Output of stream_accumulators (or merged accumulators).
+    - dataset_name (str): If given, print the ANOVA result of every factor.
+
+    Returns:
+    - dict: {factor: {"summary": DataFrame (count, mean, std, median, q1, q3), "anova": dict}}
+      where "anova" has sum_sq_between, sum_sq_within, df_between, df_within, F and p_value.
+    """
+    results = {}
+    for factor, accumulator in accumulators.items():
+        moments, histogram = accumulator["moments"], accumulator["histogram"]
+        summary = moments[["count", "mean"]].copy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            summary["std"] = np.sqrt(moments["m2"] / (moments["count"] - 1))
+        quartiles = histogram.groupby(level=0).apply(
+            lambda h: pd.Series([_histogram_quantile(h.droplevel(0), q) for q in (0.5, 0.25, 0.75)], index=["median", "q1", "q3"])
+        ).unstack()
+        summary = summary.join(quartiles)
+
+        anova = one_way_anova_from_moments(moments)
+        if dataset_name is not None:
+            p_value = anova["p_value"]
+            print(f"✅ One-Way ANOVA for {dataset_name} Data (Factor: {factor}): F = {anova['F']:.3f}, p = {p_value:.3f} -> {'Significant' if p_value < 0.1 else 'Not Significant'}")
+        results[factor] = {"summary": summary, "anova": anova}
+    return results
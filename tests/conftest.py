@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+# the analysis modules are flat scripts in the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATA_FILE = os.path.join(ROOT, "data sheet.xlsx")
+
+
+# both sheets with stripped columns, Categorical demographics and the acceptance score
+@pytest.fixture(scope="session")
+def sheets():
+    from utils import add_acceptance_score, load_data
+
+    if not os.path.exists(DATA_FILE):
+        pytest.skip("data sheet.xlsx not available")
+    return {name: add_acceptance_score(df) for name, df in zip(("Original", "Perceived"), load_data(DATA_FILE))}
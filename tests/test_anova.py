@@ -0,0 +1,125 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+smf = pytest.importorskip("statsmodels.formula.api")
+from statsmodels.stats.anova import anova_lm
+
+from accumulators import anova_f_from_aggregates, cell_moments, merge_moments, one_way_anova_from_moments, two_way_anova_from_moments
+from utils import CATEGORICAL_COLUMNS
+
+TARGET = "Acceptance_Score"
+
+
+def _frame(df, columns):
+    # plain string labels and safe names for the formula interface
+    data = df[list(columns) + [TARGET]].dropna()
+    return pd.DataFrame({f"f{i}": data[c].astype(str).to_numpy() for i, c in enumerate(columns)} | {"y": data[TARGET].to_numpy()})
+
+
+def _unbalanced(seed=0, n=150):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "A": rng.choice(["a1", "a2", "a3"], n, p=[0.5, 0.3, 0.2]),
+        "B": rng.choice(["b1", "b2", "b3"], n, p=[0.2, 0.3, 0.5]),
+    })
+    df["y"] = rng.normal(60, 15, n) + (df["A"] == "a2") * 5
+    # leave the (a3, b3) cell empty
+    return df[~((df["A"] == "a3") & (df["B"] == "b3"))].reset_index(drop=True)
+
+
+def _assert_one_way(data, group, y):
+    result = one_way_anova_from_moments(cell_moments(data, group, y))
+    reference = anova_lm(smf.ols(f"{y} ~ C({group})", data=data).fit())
+    assert result["df_between"] == reference.loc[f"C({group})", "df"]
+    assert result["df_within"] == reference.loc["Residual", "df"]
+    assert result["F"] == pytest.approx(reference.loc[f"C({group})", "F"], rel=1e-9)
+    assert result["p_value"] == pytest.approx(reference.loc[f"C({group})", "PR(>F)"], rel=1e-9)
+
+
+def _type2_reference(data, a, b, y):
+    # Type II sums of squares as drops in RSS between nested OLS fits; the full model is
+    # the cell-means model, which stays full rank when a cell is empty (anova_lm does not)
+    data = data.assign(cell=data[a].astype(str) + " | " + data[b].astype(str))
+
+    def fit(formula):
+        return smf.ols(formula, data=data).fit()
+
+    full = fit(f"{y} ~ C(cell)")
+    additive, only_a, only_b = fit(f"{y} ~ C({a}) + C({b})"), fit(f"{y} ~ C({a})"), fit(f"{y} ~ C({b})")
+    rows = {
+        a: (only_b.ssr - additive.ssr, only_b.df_resid - additive.df_resid),
+        b: (only_a.ssr - additive.ssr, only_a.df_resid - additive.df_resid),
+        f"{a}:{b}": (additive.ssr - full.ssr, additive.df_resid - full.df_resid),
+    }
+    return rows, full.ssr, full.df_resid
+
+
+def _assert_two_way(data, a, b, y):
+    table = two_way_anova_from_moments(cell_moments(data, [a, b], y))
+    rows, ssr, df_resid = _type2_reference(data, a, b, y)
+    assert table.loc["Residual", "sum_sq"] == pytest.approx(ssr, rel=1e-9)
+    assert table.loc["Residual", "df"] == df_resid
+    for term, (sum_sq, df) in rows.items():
+        assert table.loc[term, "df"] == df
+        assert table.loc[term, "sum_sq"] == pytest.approx(sum_sq, rel=1e-7, abs=1e-8)
+    return table
+
+
+@pytest.mark.parametrize("sheet", ["Original", "Perceived"])
+@pytest.mark.parametrize("factor", range(len(CATEGORICAL_COLUMNS)))
+def test_one_way_matches_anova_lm_on_sheets(sheets, sheet, factor):
+    _assert_one_way(_frame(sheets[sheet], [CATEGORICAL_COLUMNS[factor]]), "f0", "y")
+
+
+def test_one_way_matches_anova_lm_on_unbalanced_data():
+    data = _unbalanced()
+    _assert_one_way(data, "A", "y")
+    # an unused category level is an empty group and is left out, like the string labels
+    with_empty = data.assign(G=pd.Categorical(data["A"], categories=["a1", "a2", "a3", "a4"]))
+    assert one_way_anova_from_moments(cell_moments(with_empty, "G", "y")) == one_way_anova_from_moments(cell_moments(data, "A", "y"))
+
+
+def test_anova_f_from_aggregates_ignores_empty_groups():
+    data = _unbalanced()
+    grouped = data.groupby("A")["y"]
+    counts, sums, sums_sq = grouped.count(), grouped.sum(), grouped.apply(lambda v: (v ** 2).sum())
+    padded = anova_f_from_aggregates(np.append(counts, 0), np.append(sums, 0), np.append(sums_sq, 0))
+    reference = anova_lm(smf.ols("y ~ C(A)", data=data).fit())
+    assert padded["df_between"] == 2
+    assert padded["F"] == pytest.approx(reference.loc["C(A)", "F"], rel=1e-7)
+    assert padded["p_value"] == pytest.approx(reference.loc["C(A)", "PR(>F)"], rel=1e-7)
+
+
+def test_merged_moments_give_the_same_anova():
+    data = _unbalanced()
+    merged = merge_moments(cell_moments(data.iloc[:40], ["A", "B"], "y"), cell_moments(data.iloc[40:], ["A", "B"], "y"))
+    pd.testing.assert_frame_equal(two_way_anova_from_moments(merged), two_way_anova_from_moments(cell_moments(data, ["A", "B"], "y")))
+
+
+@pytest.mark.parametrize("sheet", ["Original", "Perceived"])
+@pytest.mark.parametrize("pair", list(combinations(range(len(CATEGORICAL_COLUMNS)), 2)))
+def test_two_way_matches_type2_anova_lm_on_sheets(sheets, sheet, pair):
+    data = _frame(sheets[sheet], [CATEGORICAL_COLUMNS[i] for i in pair])
+    table = _assert_two_way(data, "f0", "f1", "y")
+    if data.groupby(["f0", "f1"]).ngroups == data["f0"].nunique() * data["f1"].nunique():
+        # every cell is present, so statsmodels' Type II table applies directly
+        reference = anova_lm(smf.ols("y ~ C(f0) * C(f1)", data=data).fit(), typ=2)
+        np.testing.assert_allclose(table[["sum_sq", "df"]].to_numpy(), reference[["sum_sq", "df"]].to_numpy(), rtol=1e-7, atol=1e-8)
+        np.testing.assert_allclose(table["PR(>F)"].to_numpy(), reference["PR(>F)"].to_numpy(), rtol=1e-6, equal_nan=True)
+
+
+def test_two_way_on_unbalanced_data():
+    extra = pd.DataFrame({"A": ["a3"] * 3, "B": ["b3"] * 3, "y": [55.0, 61.0, 70.0]})
+    complete = pd.concat([_unbalanced(), extra], ignore_index=True)
+    table = _assert_two_way(complete, "A", "B", "y")
+    reference = anova_lm(smf.ols("y ~ C(A) * C(B)", data=complete).fit(), typ=2)
+    np.testing.assert_allclose(table[["sum_sq", "df", "F"]].to_numpy(), reference[["sum_sq", "df", "F"]].to_numpy(), rtol=1e-7, equal_nan=True)
+
+
+def test_two_way_with_an_empty_cell():
+    table = _assert_two_way(_unbalanced(), "A", "B", "y")
+    # one of the 2 x 2 interaction contrasts is not estimable without the (a3, b3) cell
+    assert table.loc["A:B", "df"] == 3
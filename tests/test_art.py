@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats as stats
+
+smf = pytest.importorskip("statsmodels.formula.api")
+from statsmodels.stats.anova import anova_lm
+
+from non_parametric_tests import art_anova_table
+
+
+def _unbalanced_2x3(seed=0):
+    # 2 x 3 design with unequal cell sizes and tied scores, like the Acceptance_Score
+    rng = np.random.default_rng(seed)
+    sizes = {("a1", "b1"): 12, ("a1", "b2"): 7, ("a1", "b3"): 20, ("a2", "b1"): 5, ("a2", "b2"): 15, ("a2", "b3"): 9}
+    rows = []
+    for (a, b), size in sizes.items():
+        shift = (a == "a2") * 0.8 + (b == "b3") * 0.5 + (a == "a2" and b == "b2") * 1.2
+        ratings = np.clip(np.round(rng.normal(4 + shift, 1.3, (size, 4))), 1, 7)
+        rows += [(a, b, score) for score in ratings.mean(axis=1) * 100 / 7]
+    return pd.DataFrame(rows, columns=["A", "B", "y"])
+
+
+def _art_reference(df):
+    # ARTool: align per effect (cell residual + effect estimated from marginal means),
+    # rank, and fit the full factorial OLS with sum-to-zero contrasts for a Type III test
+    grand = df["y"].mean()
+    cell = df.groupby(["A", "B"])["y"].transform("mean")
+    mean_a = df.groupby("A")["y"].transform("mean")
+    mean_b = df.groupby("B")["y"].transform("mean")
+    estimates = {"A": mean_a - grand, "B": mean_b - grand, "A:B": cell - mean_a - mean_b + grand}
+    terms = {"A": "C(A, Sum)", "B": "C(B, Sum)", "A:B": "C(A, Sum):C(B, Sum)"}
+    table = {}
+    for effect, estimate in estimates.items():
+        data = df.assign(ranked=stats.rankdata(df["y"] - cell + estimate))
+        fit = smf.ols("ranked ~ C(A, Sum) * C(B, Sum)", data=data).fit()
+        row = anova_lm(fit, typ=3).loc[terms[effect]]
+        table[effect] = (row["sum_sq"], row["df"], row["F"], row["PR(>F)"], fit.df_resid)
+    return pd.DataFrame.from_dict(table, orient="index", columns=["sum_sq", "df", "F", "PR(>F)", "df_resid"])
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_art_matches_aligned_rank_ols_on_unbalanced_2x3(seed):
+    df = _unbalanced_2x3(seed)
+    result = art_anova_table(df, ["A", "B"], "y")
+    expected = _art_reference(df)
+    assert list(result.index) == ["A", "B", "A:B"]
+    np.testing.assert_allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), rtol=1e-7)
+
+
+def test_art_with_the_factors_swapped():
+    df = _unbalanced_2x3()
+    result = art_anova_table(df, ["B", "A"], "y")
+    expected = _art_reference(df)
+    np.testing.assert_allclose(result.loc[["A", "B", "B:A"]].to_numpy(dtype=float), expected.to_numpy(dtype=float), rtol=1e-7)
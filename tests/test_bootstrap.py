@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats as stats
+
+import bootstrap
+from bootstrap import _jackknife, bootstrap_difference_ci, bootstrap_group_ci
+
+
+def _frame(samples):
+    return pd.DataFrame({"group": np.repeat(list(samples), [len(v) for v in samples.values()]),
+                         "y": np.concatenate(list(samples.values()))})
+
+
+@pytest.mark.parametrize("statistic", ["mean", "median"])
+@pytest.mark.parametrize("n", [1, 2, 5, 6, 31])
+def test_closed_form_jackknife_matches_leave_one_out(statistic, n):
+    values = np.random.default_rng(n).integers(1, 8, n) * 1.0  # with ties
+    function = np.mean if statistic == "mean" else np.median
+    expected = [function(np.delete(values, i)) for i in range(n)] if n > 1 else [np.nan]
+    np.testing.assert_allclose(_jackknife(values, statistic), expected)
+
+
+@pytest.mark.parametrize("statistic", ["mean", "median"])
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_group_ci_matches_scipy_bootstrap(statistic, method):
+    rng = np.random.default_rng(1)
+    sample = rng.gamma(2.0, 10.0, 80)
+    result = bootstrap_group_ci(_frame({"a": sample}), "group", "y", statistic=statistic, method=method,
+                                n_resamples=20_000, seed=2).loc["a"]
+    expected = stats.bootstrap((sample,), np.mean if statistic == "mean" else np.median, n_resamples=20_000,
+                               method="BCa" if method == "bca" else "percentile", rng=np.random.default_rng(3))
+    # both are Monte Carlo estimates of the same interval
+    tolerance = 0.05 * sample.std()
+    assert result["estimate"] == pytest.approx(np.mean(sample) if statistic == "mean" else np.median(sample))
+    assert result["ci_low"] == pytest.approx(expected.confidence_interval.low, abs=tolerance)
+    assert result["ci_high"] == pytest.approx(expected.confidence_interval.high, abs=tolerance)
+
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_difference_ci_matches_scipy_bootstrap(method):
+    rng = np.random.default_rng(4)
+    reference, other = rng.normal(60, 10, 50), rng.normal(66, 14, 35)
+    result = bootstrap_difference_ci(_frame({"a": reference, "b": other}), "group", "y", method=method,
+                                     n_resamples=20_000, seed=5).loc["b"]
+    expected = stats.bootstrap((other, reference), lambda x, y, axis=-1: x.mean(axis=axis) - y.mean(axis=axis),
+                               n_resamples=20_000, method="BCa" if method == "bca" else "percentile",
+                               rng=np.random.default_rng(6))
+    assert result["difference"] == pytest.approx(other.mean() - reference.mean())
+    assert result["ci_low"] == pytest.approx(expected.confidence_interval.low, abs=0.5)
+    assert result["ci_high"] == pytest.approx(expected.confidence_interval.high, abs=0.5)
+
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_mean_ci_coverage(method):
+    # 300 independent normal samples as groups of one call; about 95% of the intervals contain 0
+    rng = np.random.default_rng(7)
+    samples = {f"g{i}": rng.normal(0, 1, 40) for i in range(300)}
+    result = bootstrap_group_ci(_frame(samples), "group", "y", method=method, n_resamples=2000, seed=8)
+    coverage = ((result["ci_low"] <= 0) & (0 <= result["ci_high"])).mean()
+    assert 0.89 <= coverage <= 0.99
+
+
+def test_index_matrix_stays_within_the_element_budget(monkeypatch):
+    rng = np.random.default_rng(9)
+    df = _frame({"a": rng.normal(size=700), "b": rng.normal(size=300)})
+    expected = bootstrap_group_ci(df, "group", "y", n_resamples=3000, seed=10)
+
+    shapes = []
+    segment_statistic = bootstrap._segment_statistic
+
+    def recording(samples, *args):
+        shapes.append(samples.shape)
+        return segment_statistic(samples, *args)
+
+    monkeypatch.setattr(bootstrap, "MAX_BATCH_ELEMENTS", 50_000)
+    monkeypatch.setattr(bootstrap, "_segment_statistic", recording)
+    result = bootstrap_group_ci(df, "group", "y", n_resamples=3000, seed=10)
+
+    resample_batches = [rows * n for rows, n in shapes if rows > 1]
+    assert resample_batches and max(resample_batches) <= 50_000
+    # the batch size does not change the seeded draws
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# imported inside the functions that need them (user-005), not when the module loads
+LAZY_DEPENDENCIES = ("pingouin", "statsmodels", "seaborn", "matplotlib", "pyarrow", "scikit_posthocs")
+
+# pandas may load pyarrow itself, so only the modules added on top of pandas, numpy and scipy count
+PROBE = """
+import sys
+import numpy, pandas, scipy.stats
+before = set(sys.modules)
+import {module}
+print(" ".join(sorted({{name.split(".")[0] for name in set(sys.modules) - before}})))
+"""
+
+
+@pytest.mark.parametrize("module", ["utils", "parametric_tests", "non_parametric_tests", "main"])
+def test_heavy_dependencies_are_not_imported_eagerly(module):
+    loaded = subprocess.run([sys.executable, "-c", PROBE.format(module=module)], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout.split()
+    assert not set(loaded).intersection(LAZY_DEPENDENCIES)
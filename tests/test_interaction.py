@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import scikit_posthocs as sp
+
+import gender_crash_effect_analysis
+from utils import interaction_codes
+
+
+def _frame(seed=0, n=120):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Gender": pd.Categorical(rng.choice(["Male", "Female"], n), categories=["Male", "Female"]),
+        "Crash experience": pd.Categorical(rng.choice(["Crash free", "Crash experienced"], n),
+                                           categories=["Crash free", "Crash experienced"]),
+        "Acceptance_Score": rng.integers(4, 29, n) * 25 / 7,
+    })
+    df.loc[[3, 40, 77], "Gender"] = np.nan
+    df.loc[[5, 40], "Crash experience"] = np.nan
+    return df
+
+
+def test_interaction_codes_leave_out_missing_categories():
+    df = _frame()
+    keys, labels = interaction_codes(df, ["Gender", "Crash experience"], " - ")
+    missing = df[["Gender", "Crash experience"]].isna().any(axis=1)
+    assert (keys[missing] == -1).all()
+    assert (keys[~missing] >= 0).all()
+    # declared level order, and no "nan" combination
+    assert list(labels.values()) == ["Male - Crash free", "Male - Crash experienced",
+                                     "Female - Crash free", "Female - Crash experienced"]
+    expected = df["Gender"].astype(str) + " - " + df["Crash experience"].astype(str)
+    assert (keys[~missing].map(labels) == expected[~missing]).all()
+
+
+def test_dunn_test_drops_rows_with_a_missing_category(monkeypatch):
+    monkeypatch.setenv("RESULT_CACHE", "0")
+    df = _frame()
+    result = gender_crash_effect_analysis.perform_dunn_test(df.copy(), "Test")
+    assert result.shape == (4, 4)
+
+    # the string key the helper was built on, NaN when a category is missing
+    reference = df.assign(Group=df["Gender"].astype(object) + " - " + df["Crash experience"].astype(object))
+    expected = sp.posthoc_dunn(reference.dropna(subset=["Group"]), val_col="Acceptance_Score", group_col="Group",
+                               p_adjust="bonferroni")
+    pd.testing.assert_frame_equal(result.loc[expected.index, expected.columns], expected,
+                                  check_names=False, check_index_type=False, check_column_type=False)
+
+
+def test_interaction_codes_with_every_row_missing():
+    df = _frame().assign(Gender=pd.Categorical([np.nan] * 120, categories=["Male", "Female"]))
+    keys, labels = interaction_codes(df, ["Gender", "Crash experience"])
+    assert (keys == -1).all() and labels == {}
+
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import scipy.stats as stats
+
+import permutation_tests
+from permutation_tests import permutation_test
+from ranks import rank_values
+
+
+def _welch_t(x, y, axis=-1):
+    return np.abs(stats.ttest_ind(x, y, equal_var=False, axis=axis).statistic)
+
+
+def _pooled_t(x, y, axis=-1):
+    return np.abs(stats.ttest_ind(x, y, equal_var=True, axis=axis).statistic)
+
+
+def _samples(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(60, 12, 6), rng.normal(72, 12, 5)
+
+
+@pytest.mark.parametrize("equal_var, reference", [(False, _welch_t), (True, _pooled_t)])
+def test_exact_t_matches_scipy(equal_var, reference):
+    x, y = _samples()
+    values, groups = np.concatenate([x, y]), ["a"] * len(x) + ["b"] * len(y)
+    result = permutation_test(values, groups, "t", equal_var=equal_var, n_permutations=10_000, seed=1)
+    expected = stats.permutation_test((x, y), reference, permutation_type="independent", vectorized=True,
+                                      n_resamples=np.inf, alternative="greater")
+    assert result["exact"] and result["n_permutations"] == 462
+    assert result["statistic"] == pytest.approx(expected.statistic)
+    assert result["p_value"] == pytest.approx(expected.pvalue)
+
+
+def test_exact_rank_sum_matches_exact_mann_whitney():
+    x, y = _samples(3)
+    values, groups = rank_values(np.concatenate([x, y])), ["a"] * len(x) + ["b"] * len(y)
+    result = permutation_test(values, groups, "rank_sum", n_permutations=10_000)
+    assert result["exact"]
+    assert result["p_value"] == pytest.approx(stats.mannwhitneyu(x, y, method="exact").pvalue)
+
+
+def test_random_t_matches_scipy_with_a_fixed_seed():
+    rng = np.random.default_rng(7)
+    x, y = rng.normal(60, 12, 40), rng.normal(63, 15, 35)
+    values, groups = np.concatenate([x, y]), ["a"] * len(x) + ["b"] * len(y)
+    n = 20_000
+    result = permutation_test(values, groups, "t", n_permutations=n, seed=11)
+    expected = stats.permutation_test((x, y), _welch_t, permutation_type="independent", vectorized=True,
+                                      n_resamples=n, alternative="greater", rng=np.random.default_rng(11))
+    assert not result["exact"]
+    # both are Monte Carlo estimates of the same p-value, (extreme + 1) / (n + 1)
+    assert result["p_value"] == pytest.approx(expected.pvalue, abs=4 * np.sqrt(expected.pvalue * (1 - expected.pvalue) / n))
+    # the seed fixes the result, whatever the number of workers
+    assert permutation_test(values, groups, "t", n_permutations=n, seed=11, n_jobs=2)["p_value"] == result["p_value"]
+
+
+def test_random_kruskal_matches_scipy_with_a_fixed_seed():
+    rng = np.random.default_rng(5)
+    samples = [rng.integers(1, 8, size) * 1.0 for size in (20, 25, 15)]
+    values = np.concatenate(samples)
+    groups = np.repeat(["a", "b", "c"], [len(s) for s in samples])
+    n = 5_000
+    result = permutation_test(rank_values(values), groups, "kruskal", n_permutations=n, seed=3)
+    expected = stats.permutation_test(samples, lambda *s: stats.kruskal(*s).statistic, permutation_type="independent",
+                                      n_resamples=n, alternative="greater", rng=np.random.default_rng(3))
+    assert result["p_value"] == pytest.approx(expected.pvalue, abs=4 * np.sqrt(expected.pvalue * (1 - expected.pvalue) / n))
+
+
+def test_label_matrix_stays_within_the_element_budget(monkeypatch):
+    x, y = _samples()
+    exact_values, exact_groups = np.concatenate([x, y]), ["a"] * len(x) + ["b"] * len(y)
+    rng = np.random.default_rng(4)
+    values = rng.normal(60, 12, 500)
+    groups = np.repeat(["a", "b", "c"], [200, 150, 150])
+    exact = permutation_test(exact_values, exact_groups, "t", n_permutations=10_000)
+    expected = permutation_test(values, groups, "kruskal", n_permutations=3000, seed=2)
+
+    shapes = []
+    statistic = permutation_tests._statistic
+
+    def recording(values, labels, *args):
+        shapes.append(labels.shape)
+        return statistic(values, labels, *args)
+
+    monkeypatch.setattr(permutation_tests, "MAX_BATCH_ELEMENTS", 20_000)
+    monkeypatch.setattr(permutation_tests, "_statistic", recording)
+    result = permutation_test(values, groups, "kruskal", n_permutations=3000, seed=2)
+    assert permutation_test(exact_values, exact_groups, "t", n_permutations=10_000) == exact
+
+    batches = [rows * n for rows, n in shapes if rows > 1]
+    assert batches and max(batches) <= 20_000
+    assert result["n_permutations"] == 3000
+    assert result["p_value"] == pytest.approx(expected["p_value"], abs=4 * np.sqrt(0.25 / 3000))
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats as stats
+
+from accumulators import kruskal_from_histogram, mann_whitney_from_histogram, value_histogram
+from non_parametric_tests import kruskal_wallis, mann_whitney_u_test
+from ranks import midranks, rank_values, tie_counts, tie_term
+
+
+def _tied(n, seed=0):
+    # the Acceptance_Score grid: mean of four 1-7 ratings on a 0-100 scale
+    return np.random.default_rng(seed).integers(4, 29, n) * 25 / 7
+
+
+def _untied(n, seed=0):
+    return np.random.default_rng(seed).permutation(n) * 1.5 + 0.25
+
+
+def _frame(groups):
+    return pd.DataFrame({"group": np.repeat(list(groups), [len(v) for v in groups.values()]),
+                         "y": np.concatenate(list(groups.values()))})
+
+
+@pytest.mark.parametrize("values", [_tied(200), _untied(50), np.array([3.0]), np.array([2.0, 2.0, 2.0])])
+def test_rank_values_matches_rankdata(values):
+    np.testing.assert_allclose(rank_values(values), stats.rankdata(values))
+
+
+def test_weighted_ranks_match_ranks_of_the_expanded_values():
+    values, weights = np.array([5.0, 1.0, 3.0, 9.0]), np.array([3, 1, 4, 2])
+    expanded = stats.rankdata(np.repeat(values, weights))
+    np.testing.assert_allclose(np.repeat(rank_values(values, weights), weights), expanded)
+
+
+def test_tie_counts_midranks_and_tie_term():
+    values = _tied(300, seed=1)
+    codes, levels, counts = tie_counts(values)
+    np.testing.assert_array_equal(levels, np.unique(values))
+    np.testing.assert_array_equal(levels[codes], values)
+    np.testing.assert_allclose(midranks(counts)[codes], stats.rankdata(values))
+    _, expected_counts = np.unique(values, return_counts=True)
+    assert tie_term(counts) == ((expected_counts ** 3 - expected_counts).sum())
+    # tiecorrect = 1 - sum(t^3 - t) / (n^3 - n)
+    assert 1 - tie_term(counts) / (len(values) ** 3 - len(values)) == pytest.approx(stats.tiecorrect(stats.rankdata(values)))
+
+
+@pytest.mark.parametrize("make", [_tied, _untied])
+def test_kruskal_from_histogram_matches_scipy(make):
+    groups = {"a": make(40, 1), "b": make(25, 2) + 1.5, "c": make(33, 3)}
+    h_stat, p_value = kruskal_from_histogram(value_histogram(_frame(groups), "group", "y"))
+    expected = stats.kruskal(*groups.values())
+    assert h_stat == pytest.approx(expected.statistic)
+    assert p_value == pytest.approx(expected.pvalue)
+
+
+@pytest.mark.parametrize("make", [_tied, _untied])
+def test_mann_whitney_from_histogram_matches_asymptotic_scipy(make):
+    groups = {"a": make(40, 4), "b": make(31, 5) + 2.0}
+    u1, p_value = mann_whitney_from_histogram(value_histogram(_frame(groups), "group", "y"), first="b")
+    expected = stats.mannwhitneyu(groups["b"], groups["a"], method="asymptotic")
+    assert u1 == pytest.approx(expected.statistic)
+    assert p_value == pytest.approx(expected.pvalue)
+
+
+@pytest.mark.parametrize("sizes, make, method", [
+    ((6, 9), _untied, "exact"),  # smaller group <= 8 without ties: scipy's exact distribution
+    ((8, 8), _untied, "exact"),
+    ((9, 12), _untied, "asymptotic"),  # both groups > 8: normal approximation
+    ((6, 9), _tied, "asymptotic"),  # ties: normal approximation with tie correction
+    ((40, 55), _tied, "asymptotic"),
+])
+def test_mann_whitney_u_test_switches_like_scipy(sizes, make, method):
+    values = make(sum(sizes), seed=sum(sizes))
+    groups = {"a": values[:sizes[0]], "b": values[sizes[0]:]}
+    if make is _tied:
+        assert len(np.unique(values)) < len(values)
+    p_value = mann_whitney_u_test(_frame(groups), "group", "y", "Test")
+    assert p_value == pytest.approx(stats.mannwhitneyu(groups["a"], groups["b"], method=method).pvalue)
+    assert p_value == pytest.approx(stats.mannwhitneyu(groups["a"], groups["b"]).pvalue)
+
+
+def test_kruskal_wallis_matches_scipy():
+    groups = {"a": _tied(30, 6), "b": _tied(45, 7), "c": _tied(12, 8) + 5}
+    assert kruskal_wallis(_frame(groups), "group", "y", "Test") == pytest.approx(stats.kruskal(*groups.values()).pvalue)
@@ -1,38 +1,357 @@
+import hashlib
+import os
+import re
+import warnings
+from multiprocessing import shared_memory
 import pandas as pd
 import scipy.stats as stats
-import statsmodels.api as sm
-import statsmodels.formula.api as smf
-import pingouin as pg
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from accumulators import cronbach_alpha_from_moments, item_moments
+
+# pingouin, matplotlib and pyarrow are imported inside the functions that need
+# them, so `import utils` only pays for pandas, numpy and scipy.stats
+
+def _arrow():
+    # columnar cache is optional, callers fall back to parsing the workbook without pyarrow
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError:
+        return None
+    return pa
 
 reliability_vars = ['ADAS "Safe" rating (1-7) TAM', 'ADAS "Desirable" rating (1-7) TAM', 'ADAS "Pleasant" rating (1-7) TAM', 'ADAS "Comfortable" rating (1-7) TAM']
 
+# declared level order of the demographic columns; the sheets label some levels differently,
+# and levels not listed here follow the listed ones in sorted order
+CATEGORY_LEVELS = {
+    "Gender": ["Male", "Female"],
+    "age group": ["18 to 30", "18 to 30 years", "30 to 50", "30 to 50 years", "> 50", "> 50 years"],
+    "Driving experience in years": ["No experience", "< 2 years", "2 to 5 years", "> 5 years"],
+    "Driver education": ["< Bachelor's degree", "Bachelor's degree", "> Bachelor's degree"],
+    "Crash experience": ["Crash free", "Crash experienced"],
+}
+
+CACHE_DIR = ".cache"
+
+# key the columnar cache on the workbook content hash and its mtime
+def _workbook_cache_key(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(str(os.stat(file_path).st_mtime_ns).encode())
+    return digest.hexdigest()[:16]
+
+def _cache_paths(file_path, key):
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR)
+    stem = os.path.splitext(os.path.basename(file_path))[0].replace(" ", "_")
+    return cache_dir, stem, [os.path.join(cache_dir, f"{stem}-{key}-{i}.arrow") for i in range(2)]
+
+def _read_arrow(path):
+    pa = _arrow()
+    # memory map the IPC file so the column buffers are read straight from the page cache
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+def _write_arrow(df, path):
+    pa = _arrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
 # Load the Excel file (Original & Perceived Data)
-def load_data(file_path="data sheet.xlsx"):
-    xls = pd.ExcelFile(file_path)
-    df_original = xls.parse(sheet_name=xls.sheet_names[0])  
-    df_perceived = xls.parse(sheet_name=xls.sheet_names[1])
+def load_data(file_path="data sheet.xlsx", use_cache=True):
+    """
+    Loads the Original & Perceived sheets of the workbook.
+
+    The first call converts both sheets into Arrow IPC files under ".cache/" next to
+    the workbook, keyed by the workbook's content hash and mtime. Later calls memory
+    map those files instead of re-parsing the Excel workbook.
+
+    Parameters:
+    - file_path (str): Path of the Excel workbook.
+    - use_cache (bool): Set to False to always parse the workbook.
+
+    Returns:
+    - tuple: (df_original, df_perceived), normalised by normalize_frame.
+    """
+    pa = _arrow()
+    if not use_cache or pa is None:
+        return _parse_workbook(file_path)
+
+    cache_dir, stem, cache_files = _cache_paths(file_path, _workbook_cache_key(file_path))
+    if all(os.path.exists(path) for path in cache_files):
+        try:
+            return tuple(normalize_frame(_read_arrow(path)) for path in cache_files)
+        except (OSError, pa.ArrowException):
+            pass  # corrupt or partial cache, rebuild it below
+
+    df_original, df_perceived = _parse_workbook(file_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # drop cache files of older versions of this workbook
+        stale = re.compile(rf"{re.escape(stem)}-[0-9a-f]{{16}}-\d\.arrow(\.\d+\.tmp)?")
+        for name in os.listdir(cache_dir):
+            if stale.fullmatch(name) and os.path.join(cache_dir, name) not in cache_files:
+                os.remove(os.path.join(cache_dir, name))
+        for df, path in zip((df_original, df_perceived), cache_files):
+            _write_arrow(df, path)
+    except (OSError, pa.ArrowException) as e:
+        print(f"⚠️ Could not write columnar cache for '{file_path}': {e}")
+
     return df_original, df_perceived
 
+def _parse_workbook(file_path):
+    with pd.ExcelFile(file_path) as xls:
+        df_original = xls.parse(sheet_name=xls.sheet_names[0])
+        df_perceived = xls.parse(sheet_name=xls.sheet_names[1])
+    return normalize_frame(df_original), normalize_frame(df_perceived)
+
+# Strip column names and labels once and store the demographics as Categoricals
+def normalize_frame(df, levels=CATEGORY_LEVELS):
+    """
+    Cleans a loaded sheet in place: strips the column names and the labels of the
+    CATEGORY_LEVELS columns and converts those columns to pandas Categoricals whose
+    categories are the levels present, in the declared order. Missing values stay missing.
+    Calling it again on a normalised frame changes nothing.
+
+    Returns:
+    - DataFrame: The same frame.
+    """
+    df.columns = df.columns.str.strip()
+    for column, declared in levels.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if not isinstance(values.dtype, pd.CategoricalDtype) and pd.api.types.is_string_dtype(values.dtype):
+            values = values.str.strip()
+        present = set(values.dropna().unique())
+        categories = [level for level in declared if level in present] + sorted(present.difference(declared), key=str)
+        df[column] = pd.Categorical(values, categories=categories)
+    return df
+
+# levels of a categorical column that occur in it, in category order
+def category_levels(values):
+    return pd.Categorical(values).remove_unused_categories().categories.tolist()
+
 # Perform Cronbach's Alpha test for reliability
 def check_reliability(df, columns=reliability_vars):
-    alpha, _ = pg.cronbach_alpha(df[columns])
-    return alpha
+    # closed form from the item covariance matrix (see reliability.py for CIs and alpha-if-item-deleted)
+    if df[columns].isna().any().any():
+        import pingouin as pg
+
+        # pingouin's pairwise covariances keep the rows with a single missing rating
+        alpha, _ = pg.cronbach_alpha(df[columns])
+        return alpha
+    return cronbach_alpha_from_moments(item_moments(df, columns))
+
+def report_reliability(alpha, dataset_name):
+    if alpha > 0.7:
+        print(f"✅ Cronbach's Alpha for {dataset_name} Data: {alpha:.3f} (accepted, alpha > 0.7)")
+    else:
+        print(f"❌ Cronbach's Alpha for {dataset_name} Data: {alpha:.3f} (rejected, alpha < 0.7)")
+
+# scored datasets already prepared in this process, keyed by workbook path
+_prepared_data = {}
+
+# Load, check reliability & calculate acceptance score once per process
+def prepare_data(file_path="data sheet.xlsx"):
+    """
+    Loads both datasets, reports Cronbach's Alpha and calculates the acceptance scores.
+
+    The scored pair is kept in memory, so analyses run one after another in the same
+    process (e.g. main.py --all) load and score the workbook only once. Each call
+    returns fresh copies because the analyses modify the frames they are given.
+
+    Parameters:
+    - file_path (str): Path of the Excel workbook.
+
+    Returns:
+    - tuple: (df_original, df_perceived) with U, EOU and Acceptance_Score columns.
+    """
+    key = os.path.abspath(file_path)
+    if key not in _prepared_data:
+        df_original, df_perceived = load_data(file_path)
+
+        alpha_original = check_reliability(df_original)
+        alpha_perceived = check_reliability(df_perceived)
+
+        df_original = calculate_acceptance_score(df_original, "Original")
+        df_perceived = calculate_acceptance_score(df_perceived, "Perceived")
+        _prepared_data[key] = (df_original, df_perceived, alpha_original, alpha_perceived)
+
+    df_original, df_perceived, alpha_original, alpha_perceived = _prepared_data[key]
+    report_reliability(alpha_original, "Original")
+    report_reliability(alpha_perceived, "Perceived")
+    return df_original.copy(), df_perceived.copy()
+
+# columns the analyses read once the acceptance score is calculated
+CATEGORICAL_COLUMNS = ["Gender", "age group", "Driving experience in years", "Driver education", "Crash experience"]
+SCORE_COLUMNS = ["U", "EOU", "Acceptance_Score"]
+
+# shared memory block attached by this (worker) process, kept open while its arrays are in use
+_attached_block = None
+
+def _code_dtype(n_categories):
+    # signed, because missing values are coded -1
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+# Publish the scored datasets to worker processes through shared memory
+def share_prepared_data(file_path="data sheet.xlsx", score_dtype=np.float64):
+    """
+    Copies the columns the analyses read into one shared memory block in a compact form:
+    integer category codes for CATEGORICAL_COLUMNS and float arrays for SCORE_COLUMNS.
+
+    Worker processes call attach_prepared_data with the returned spec instead of
+    receiving pickled object-dtype DataFrames. The caller owns the block and must
+    close() and unlink() it once the workers are done.
+
+    Parameters:
+    - file_path (str): Path of the Excel workbook.
+    - score_dtype (dtype): np.float64 (default) or np.float32 for the score arrays.
+
+    Returns:
+    - tuple: (SharedMemory block, spec dict to pass to attach_prepared_data)
+    """
+    key = os.path.abspath(file_path)
+    if key not in _prepared_data:
+        prepare_data(file_path)
+    df_original, df_perceived, alpha_original, alpha_perceived = _prepared_data[key]
+
+    arrays, categories = {}, {}
+    for dataset_name, df in (("Original", df_original), ("Perceived", df_perceived)):
+        arrays[dataset_name], categories[dataset_name] = {}, {}
+        for column in CATEGORICAL_COLUMNS:
+            if column in df.columns:
+                values = pd.Categorical(df[column])
+                arrays[dataset_name][column] = values.codes.astype(_code_dtype(len(values.categories)))
+                categories[dataset_name][column] = (values.categories.tolist(), str(df[column].dtype))
+        for column in SCORE_COLUMNS:
+            if column in df.columns:
+                arrays[dataset_name][column] = df[column].to_numpy(dtype=score_dtype)
+
+    # lay the arrays out back to back, each aligned to 8 bytes
+    layout, size = {}, 0
+    for dataset_name, columns in arrays.items():
+        layout[dataset_name] = {}
+        for column, values in columns.items():
+            layout[dataset_name][column] = (size, values.dtype.str, len(values))
+            size += -(-values.nbytes // 8) * 8
+
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for dataset_name, columns in arrays.items():
+        for column, values in columns.items():
+            offset, dtype, length = layout[dataset_name][column]
+            np.ndarray(length, dtype=dtype, buffer=block.buf, offset=offset)[:] = values
+
+    spec = {"name": block.name, "file_path": key, "layout": layout, "categories": categories,
+            "alphas": (alpha_original, alpha_perceived)}
+    return block, spec
+
+def attach_prepared_data(spec):
+    """
+    Attaches to a block created by share_prepared_data and registers its datasets,
+    so prepare_data in this process returns them without loading the workbook.
+
+    The score columns of the registered frames and the returned arrays are read-only
+    views of the shared block; nothing is copied on attach.
+
+    Returns:
+    - dict: {"Original": {column: array}, "Perceived": {...}} with category codes for
+      CATEGORICAL_COLUMNS (labels in spec["categories"][dataset][column][0]) and the score arrays, e.g. for
+      permutation or bootstrap workers.
+    """
+    global _attached_block
+    _attached_block = shared_memory.SharedMemory(name=spec["name"])
+
+    arrays, frames = {}, []
+    for dataset_name, columns in spec["layout"].items():
+        arrays[dataset_name], data = {}, {}
+        for column, (offset, dtype, length) in columns.items():
+            values = np.ndarray(length, dtype=dtype, buffer=_attached_block.buf, offset=offset)
+            values.flags.writeable = False
+            arrays[dataset_name][column] = values
+            if column in spec["categories"][dataset_name]:
+                # the labels are decoded locally; only the codes live in the shared block
+                labels, dtype = spec["categories"][dataset_name][column]
+                data[column] = pd.Series(pd.Categorical.from_codes(values, labels)).astype(dtype)
+            else:
+                data[column] = values
+        frames.append(pd.DataFrame(data, copy=False))
+
+    _prepared_data[spec["file_path"]] = (*frames, *spec["alphas"])
+    return arrays
+
+# The TAM ratings as one contiguous matrix in the most compact dtype that holds them
+def rating_matrix(df, columns=reliability_vars):
+    ratings = df[columns]
+    if all(pd.api.types.is_integer_dtype(dtype) for dtype in ratings.dtypes):
+        if ratings.empty or (ratings.min().min() >= 0 and ratings.max().max() <= np.iinfo(np.uint8).max):
+            return ratings.to_numpy(dtype=np.uint8)
+        if ratings.min().min() >= np.iinfo(np.int8).min and ratings.max().max() <= np.iinfo(np.int8).max:
+            return ratings.to_numpy(dtype=np.int8)
+    return ratings.to_numpy(dtype=np.float64)  # missing ratings stay NaN
+
+# Compute U, EOU and Acceptance Score of every row of a rating matrix
+def acceptance_scores(ratings, score_dtype=np.float64, out=None):
+    """
+    Scores rows of TAM ratings: U (Usefulness) and EOU (Ease of Use) are the means of the
+    first and second rating pair, found with one reduction over the (n, 2, 2) view of the
+    matrix, and the Acceptance Score is their mean on a 0-100 scale. Missing ratings are
+    skipped like DataFrame.mean does.
+
+    Parameters:
+    - ratings (array): (n, 4) ratings in reliability_vars order, e.g. from rating_matrix.
+    - score_dtype (dtype): np.float64 (default) or np.float32 for the scores.
+    - out (array): (3, n) array to write the scores into instead of allocating one.
+
+    Returns:
+    - array: (3, n) with the U, EOU and Acceptance_Score rows (out if given).
+    """
+    ratings = np.asarray(ratings)
+    if out is None:
+        out = np.empty((3, len(ratings)), dtype=score_dtype)
+    pairs = ratings.reshape(len(ratings), 2, 2)
+    if np.issubdtype(ratings.dtype, np.integer):
+        # integer sums are exact in either float dtype, so the halves match DataFrame.mean
+        np.sum(pairs, axis=2, dtype=out.dtype, out=out[:2].T)
+        out[:2] *= 0.5
+        np.add(out[0], out[1], out=out[2])
+        out[2] *= 0.5
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all ratings of a row missing -> NaN
+            out[:2] = np.nanmean(pairs, axis=2).T
+            out[2] = np.nanmean(out[:2], axis=0)
+    out[2] *= 100 / 7
+    return out
+
+# Add the U, EOU and Acceptance Score columns to a frame holding the TAM ratings
+def add_acceptance_score(df, score_dtype=np.float64):
+    scores = acceptance_scores(rating_matrix(df), score_dtype)
+    for column, values in zip(SCORE_COLUMNS, scores):
+        df[column] = values
+    return df
 
 # Calculate U, EOU, and Acceptance Score
-def calculate_acceptance_score(df, dataset_name):
+def calculate_acceptance_score(df, dataset_name, score_dtype=np.float64):
     """
     Computes User Acceptance Score using the Technology Acceptance Model (TAM).
 
     Returns:
-    DataFrame: Updated dataset with new calculated columns.
+    DataFrame: Updated dataset with new calculated columns (score_dtype, e.g. np.float32).
     """
     if set(reliability_vars).issubset(df.columns):
-        df["U"] = df[reliability_vars[:2]].mean(axis=1)  # Usefulness
-        df["EOU"] = df[reliability_vars[2:]].mean(axis=1)  # Ease of Use
-        df["Acceptance_Score"] = df[["U", "EOU"]].mean(axis=1) * (100 / 7)
+        add_acceptance_score(df, score_dtype)
         print(f"✅ Acceptance Score for {dataset_name} datasets calculated successfully!")
     else:
         print("❌ Required columns not found in dataset.")
@@ -81,12 +400,276 @@ def check_normality_on_filtered_data(data, dataset_name):
     print(f"✅ {test_used} Test for Normality in {dataset_name}: p = {p:.3f} -> {'Normal' if p > 0.10 else 'Not Normal'}")
     return p > 0.10  # Returns True if data is normal
 
-# Save updated data back to an Excel file
+# check normality of every subgroup in one pass
+def check_normality_grouped(df, by, target_variable, dataset_name=None):
+    """
+    Checks normality of target_variable within every group of the `by` columns.
+
+    The rows are sorted once by (group, value) and split at the group boundaries.
+    Groups with n >= 50 get a Kolmogorov-Smirnov test computed for all of them at once
+    with NumPy, groups with 3 <= n < 50 a Shapiro-Wilk test, smaller groups are skipped
+    (same rules as check_normality_on_filtered_data).
+
+    Parameters:
+    - df (DataFrame): Dataset (original or perceived).
+    - by (str or list): Categorical variable(s) defining the groups.
+    - target_variable (str): Variable to test (e.g., "Acceptance_Score").
+    - dataset_name (str): If given, prints one line per group for reporting.
+
+    Returns:
+    - DataFrame: One row per group with n, statistic, p, test and is_normal.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    data = df[by + [target_variable]].dropna()
+    grouped = data.groupby(by, sort=True, observed=True)
+    keys = grouped.size().index
+    codes = grouped.ngroup().to_numpy()
+    values = data[target_variable].to_numpy(dtype=float)
+
+    # single sort: rows ordered by group code, then by value within the group
+    order = np.lexsort((values, codes))
+    values = values[order]
+    n = np.bincount(codes, minlength=len(keys))
+    starts = np.concatenate(([0], np.cumsum(n)[:-1])).astype(np.intp)
+
+    statistic = np.full(len(keys), np.nan)
+    p = np.full(len(keys), np.nan)
+    test = np.full(len(keys), "Skipped", dtype=object)
+
+    if len(values):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.add.reduceat(values, starts) / n
+            dev = values - np.repeat(mean, n)
+            std = np.sqrt(np.add.reduceat(dev ** 2, starts) / (n - 1))
+
+            # Kolmogorov-Smirnov against N(mean, std) for large groups, all groups at once
+            large = n >= 50
+            if large.any():
+                cdf = stats.norm.cdf(dev / np.repeat(std, n))
+                position = np.arange(len(values)) - np.repeat(starts, n)
+                size = np.repeat(n, n)
+                distance = np.maximum((position + 1) / size - cdf, cdf - position / size)
+                d = np.maximum.reduceat(distance, starts)
+                statistic[large] = d[large]
+                p[large] = np.clip(stats.kstwo.sf(d[large], n[large]), 0, 1)
+                test[large] = "Kolmogorov-Smirnov"
+
+        # Shapiro-Wilk for small samples
+        for i in np.flatnonzero((n >= 3) & (n < 50)):
+            statistic[i], p[i] = stats.shapiro(values[starts[i]:starts[i] + n[i]])
+            test[i] = "Shapiro-Wilk"
+
+    result = pd.DataFrame({"n": n, "statistic": statistic, "p": p, "test": test, "is_normal": p > 0.10}, index=keys)
+
+    if dataset_name is not None:
+        for key, row in result.iterrows():
+            label = " x ".join(map(str, key)) if isinstance(key, tuple) else str(key)
+            if row["test"] == "Skipped":
+                print(f"⚠️ Skipping normality test for {label} {dataset_name} (sample too small: n={row['n']})")
+            else:
+                print(f"✅ {row['test']} Test for Normality in {label} {dataset_name}: p = {row['p']:.3f} -> {'Normal' if row['is_normal'] else 'Not Normal'}")
+
+    return result
+
+# compare Original vs. Perceived data cell by cell
+def compare_original_perceived(df_original, df_perceived, by, target_variable, cells):
+    """
+    Compares target_variable between matching cells of Original & Perceived data.
+    Uses a t-test when both cells are normal and a Mann-Whitney U test otherwise.
+
+    Parameters:
+    - df_original (DataFrame): Original data.
+    - df_perceived (DataFrame): Perceived data.
+    - by (list): Categorical variables defining the cells (e.g., ["Gender", "age group"]).
+    - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+    - cells (list): (original cell, perceived cell) pairs of category tuples, since the
+      two sheets label some categories differently (e.g. "18 to 30" vs "18 to 30 years").
+
+    Returns:
+    - dict: p-value for each compared cell, keyed by the perceived cell label.
+    """
+    normality = {}
+    groups = {}
+    for name, df in (("Original", df_original), ("Perceived", df_perceived)):
+        normality[name] = check_normality_grouped(df, by, target_variable)
+        groups[name] = df.dropna(subset=[target_variable]).groupby(by, observed=True)[target_variable]
+
+    p_values = {}
+    for cell_original, cell_perceived in cells:
+        label = " x ".join(cell_perceived)
+        samples, is_normal = [], True
+        for name, cell in (("Original", cell_original), ("Perceived", cell_perceived)):
+            key = tuple(cell) if len(by) > 1 else cell[0]
+            if key not in normality[name].index:
+                samples.append(pd.Series(dtype=float))
+                is_normal = False
+                print(f"⚠️ Skipping normality test for {label} {name} (sample too small: n=0)")
+                continue
+            row = normality[name].loc[key]
+            samples.append(groups[name].get_group(tuple(cell)))
+            is_normal = is_normal and bool(row["is_normal"])
+            if row["test"] == "Skipped":
+                print(f"⚠️ Skipping normality test for {label} {name} (sample too small: n={row['n']})")
+            else:
+                print(f"✅ {row['test']} Test for Normality in {label} {name}: p = {row['p']:.3f} -> {'Normal' if row['is_normal'] else 'Not Normal'}")
+
+        if min(len(sample) for sample in samples) == 0:
+            print(f"❌ Comparison skipped ({label}): no data in one of the datasets")
+            p_values[label] = np.nan
+            continue
+
+        if is_normal:
+            _, p_value = stats.ttest_ind(*samples)
+            print(f"t-test ({label}): p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+        else:
+            _, p_value = stats.mannwhitneyu(*samples, alternative='two-sided')
+            print(f"Mann-Whitney U Test ({label}): p = {p_value:.5f} {'✅ Significant' if p_value < 0.10 else '❌ Not Significant'}")
+        p_values[label] = p_value
+
+    return p_values
+
+# file extensions save_updated_data can write
+EXPORT_FORMATS = (".xlsx", ".parquet", ".csv")
+
+def _export_paths(file_name):
+    # .xlsx keeps both datasets as sheets of one workbook, .parquet/.csv write one file per dataset
+    root, ext = os.path.splitext(file_name)
+    if ext == ".xlsx":
+        return [file_name]
+    if ext in (".parquet", ".csv"):
+        return [f"{root}_original{ext}", f"{root}_perceived{ext}"]
+    raise ValueError(f"❌ Unsupported export format '{ext}' (use {', '.join(EXPORT_FORMATS)})")
+
+def _frames_digest(frames, ext):
+    digest = hashlib.sha256(ext.encode())
+    for df in frames:
+        digest.update("\x1f".join(map(str, df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def _write_atomic(path, write):
+    # write to a temporary file first so parallel analyses never leave a half written export
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.{os.getpid()}.tmp{ext}"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+# Save updated data (with U, EOU and Acceptance_Score) to an Excel, Parquet or CSV export
 def save_updated_data(df_original, df_perceived, file_name="updated_data.xlsx"):
-    with pd.ExcelWriter(file_name, engine="openpyxl") as writer:
-        df_original.to_excel(writer, sheet_name="Original Data", index=False)
-        df_perceived.to_excel(writer, sheet_name="Perceived Data", index=False)
-    print(f"✅ Updated Excel file saved as '{file_name}'")
+    """
+    Exports both datasets, skipping the write when the last export has the same content.
+
+    The export is content addressed: a hash of both frames is stored next to the
+    export under ".cache/", and as long as it matches and the files still exist
+    nothing is rewritten.
+
+    Parameters:
+    - df_original (DataFrame): Original data with the calculated columns.
+    - df_perceived (DataFrame): Perceived data with the calculated columns.
+    - file_name (str): "*.xlsx" writes one workbook with two sheets, "*.parquet" or
+      "*.csv" writes "<name>_original" and "<name>_perceived" files (much faster).
+
+    Returns:
+    - bool: True if the export was written, False if it was already up to date.
+    """
+    ext = os.path.splitext(file_name)[1]
+    paths = _export_paths(file_name)
+    digest = _frames_digest((df_original, df_perceived), ext)
+
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_name)), CACHE_DIR)
+    digest_file = os.path.join(cache_dir, f"{os.path.basename(file_name)}.sha256")
+    if all(os.path.exists(path) for path in paths) and os.path.exists(digest_file):
+        with open(digest_file) as f:
+            if f.read().strip() == digest:
+                print(f"✅ Updated data in '{file_name}' is already up to date")
+                return False
+
+    if ext == ".xlsx":
+        def write_workbook(path):
+            with pd.ExcelWriter(path, engine="openpyxl") as writer:
+                df_original.to_excel(writer, sheet_name="Original Data", index=False)
+                df_perceived.to_excel(writer, sheet_name="Perceived Data", index=False)
+        _write_atomic(file_name, write_workbook)
+    elif ext == ".parquet":
+        for df, path in zip((df_original, df_perceived), paths):
+            _write_atomic(path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+    else:
+        for df, path in zip((df_original, df_perceived), paths):
+            _write_atomic(path, lambda tmp_path: df.to_csv(tmp_path, index=False))
+
+    def write_digest(path):
+        with open(path, "w") as f:
+            f.write(digest)
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_atomic(digest_file, write_digest)
+    print(f"✅ Updated data saved as '{', '.join(paths)}'")
+    return True
+
+# integer key for each combination of categories, decoded to labels only for display
+def interaction_codes(df, categorical_vars, separator=" & "):
+    """
+    Combines the category codes of several columns into one integer key per row
+    (mixed radix: code_1 * levels_2 * ... + code_2 * levels_3 * ... + code_n), so no
+    string column is built per row. Keys sort like the tuples of labels, each column in its
+    declared level order (Categoricals, see normalize_frame) or sorted (other columns).
+
+    Parameters:
+    - df (DataFrame): Dataset (original or perceived).
+    - categorical_vars (list): Categorical variables to combine (e.g., ["Gender", "age group"]).
+    - separator (str): Text between the labels of a combination (e.g., " & ").
+
+    Returns:
+    - tuple: (Series of int64 keys aligned with df, -1 where any of the variables is missing,
+      and a dict mapping each key present to its label)
+    """
+    keys = np.zeros(len(df), dtype=np.int64)
+    missing = np.zeros(len(df), dtype=bool)
+    uniques = []
+    for var in categorical_vars:
+        codes, levels = pd.factorize(df[var], sort=True)
+        missing |= codes == -1
+        keys = keys * len(levels) + codes
+        uniques.append(levels)
+    # rows with a missing category belong to no combination, like the NaN keys of string concatenation
+    keys[missing] = -1
+
+    labels = {}
+    for key in np.unique(keys[~missing]):
+        parts, remainder = [], int(key)
+        for levels in reversed(uniques):
+            remainder, code = divmod(remainder, len(levels))
+            parts.append(str(levels[code]))
+        labels[int(key)] = separator.join(reversed(parts))
+    return pd.Series(keys, index=df.index), labels
+
+# mean, SD, count, median, quartiles, SE and IQR for individual categorical variable
+def describe_groups(df, by, target_variable):
+    """
+    Computes the summary statistics behind the mean (SE) and median (IQR) error bar plots.
+
+    Everything comes from one native groupby().describe() call, so no Python function
+    runs per group.
+
+    Parameters:
+    - df (DataFrame): The dataset (original or perceived).
+    - by (str): The categorical variable (e.g., "age group").
+    - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+
+    Returns:
+    - DataFrame: Indexed by category with mean, std, count, median, q1, q3, se and iqr.
+    """
+    described = df.groupby(by)[target_variable].describe()
+    summary_stats = pd.DataFrame({
+        "mean": described["mean"],
+        "std": described["std"],
+        "count": described["count"].astype(int),
+        "median": described["50%"],
+        "q1": described["25%"],
+        "q3": described["75%"],
+    })
+    summary_stats["se"] = summary_stats["std"] / np.sqrt(summary_stats["count"])
+    summary_stats["iqr"] = summary_stats["q3"] - summary_stats["q1"]
+    return summary_stats
 
 # mean, median and std for individual catergorical variable 
 def compare_mean_median(df, categorical_var, target_variable, dataset_name):
@@ -100,8 +683,94 @@ def compare_mean_median(df, categorical_var, target_variable, dataset_name):
 
     return summary_stats
 
+#this function aggregates every categorical variable and their interactions in one pass
+def summary_cube(df, categorical_vars, target_variable):
+    """
+    Computes count, mean, median and std for each categorical variable and every
+    interaction of them from a single pass over the data.
+
+    The rows are sorted once by (finest cell, value). Each cell keeps its row count,
+    count, sum and sum of squares and a sorted run of values, and every marginal or
+    interaction level is rolled up from the cells without going back to the frame.
+
+    Parameters:
+    - df (DataFrame): Dataset (original or perceived).
+    - categorical_vars (list): List of categorical variables (e.g., ["Gender", "age group"]).
+    - target_variable (str): The dependent variable (e.g., "Acceptance_Score"); None to only count rows.
+
+    Returns:
+    - dict: Tuple of variables, e.g. ("Gender",) or ("Gender", "age group"), mapped to a
+      DataFrame indexed by category (MultiIndex for interactions) with mean, median, std,
+      count (non-missing values) and size (rows). Missing categories are left out, as in groupby.
+    """
+    from itertools import combinations
+
+    values = np.full(len(df), np.nan) if target_variable is None else df[target_variable].to_numpy(dtype=float)
+    levels, key = [], np.zeros(len(df), dtype=np.int64)
+    for var in categorical_vars:
+        # shift the codes by one so a missing category (-1) gets a cell of its own
+        codes, uniques = pd.factorize(df[var], sort=True)
+        key = key * (len(uniques) + 1) + codes + 1
+        levels.append(uniques)
+
+    # one sort: cells are contiguous runs with their values ascending and NaN last
+    order = np.lexsort((values, key))
+    sorted_values, sorted_keys = values[order], key[order]
+    cell_keys, starts, sizes = np.unique(sorted_keys, return_index=True, return_counts=True)
+    present = ~np.isnan(sorted_values)
+    centre = np.nanmean(values) if present.any() else 0.0
+    centred = np.where(present, sorted_values - centre, 0.0)
+    if len(starts):
+        counts = np.add.reduceat(present.astype(np.int64), starts)
+        sums = np.add.reduceat(centred, starts)
+        sums_sq = np.add.reduceat(centred ** 2, starts)
+    else:
+        counts, sums, sums_sq = np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+
+    cell_codes = np.empty((len(cell_keys), len(categorical_vars)), dtype=np.int64)
+    remainder = cell_keys.copy()
+    for f in reversed(range(len(categorical_vars))):
+        cell_codes[:, f] = remainder % (len(levels[f]) + 1) - 1
+        remainder //= len(levels[f]) + 1
+
+    cube = {}
+    for size in range(1, len(categorical_vars) + 1):
+        for subset in combinations(range(len(categorical_vars)), size):
+            keep = (cell_codes[:, subset] >= 0).all(axis=1)
+            group_codes, group_of_cell = np.unique(cell_codes[keep][:, subset], axis=0, return_inverse=True)
+            group_of_cell = group_of_cell.ravel()
+            n_groups = len(group_codes)
+
+            group_sizes = np.bincount(group_of_cell, weights=sizes[keep], minlength=n_groups).astype(int)
+            group_counts = np.bincount(group_of_cell, weights=counts[keep], minlength=n_groups).astype(int)
+            group_sums = np.bincount(group_of_cell, weights=sums[keep], minlength=n_groups)
+            group_sums_sq = np.bincount(group_of_cell, weights=sums_sq[keep], minlength=n_groups)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = centre + group_sums / group_counts
+                variances = (group_sums_sq - group_sums ** 2 / group_counts) / (group_counts - 1)
+            stds = np.sqrt(np.where(group_counts > 1, np.maximum(variances, 0.0), np.nan))
+
+            # medians from the already sorted runs of the cells in each group
+            runs = [[] for _ in range(n_groups)]
+            for group, start, count in zip(group_of_cell, starts[keep], counts[keep]):
+                runs[group].append(sorted_values[start:start + count])
+            medians = np.array([np.median(np.concatenate(r)) if sum(map(len, r)) else np.nan for r in runs])
+
+            names = [categorical_vars[f] for f in subset]
+            labels = [levels[f].take(group_codes[:, i]) for i, f in enumerate(subset)]
+            if len(subset) == 1:
+                index = pd.Index(labels[0], name=names[0])
+            else:
+                index = pd.MultiIndex.from_arrays(labels, names=names)
+            cube[tuple(names)] = pd.DataFrame(
+                {"mean": means, "median": medians, "std": stds, "count": group_counts, "size": group_sizes},
+                index=index,
+            )
+
+    return cube
+
 #this function count occurrences of all combination
-def count_combinations(df, cat1_var, cat2_var, dataset_name):
+def count_combinations(df, cat1_var, cat2_var, dataset_name, cube=None):
     """
     Counts occurrences of each category in Age Group & Gender.
 
@@ -110,22 +779,26 @@ def count_combinations(df, cat1_var, cat2_var, dataset_name):
     - age_var (str): Column name for Age Group (e.g., "age group").
     - gender_var (str): Column name for Gender (e.g., "Gender").
     - dataset_name (str): Name of the dataset for printing.
+    - cube (dict): summary_cube of df covering cat1_var and cat2_var; computed here if not given.
 
     Returns:
     - dict: Dictionary of category counts.
     """
     print(f"\n📊 **Category Counts for {dataset_name} Data:**\n")
 
+    if cube is None:
+        cube = summary_cube(df, [cat1_var, cat2_var], None)
+
     # Count total occurrences of each gender
-    cat1_counts = df[cat1_var].value_counts()
+    cat1_counts = cube[(cat1_var,)]["size"].rename("count").sort_values(ascending=False)
     print(f"✅ {cat1_var} counts:\n{cat1_counts}\n")
 
     # Count total occurrences of each age group
-    cat1_counts = df[cat2_var].value_counts()
+    cat1_counts = cube[(cat2_var,)]["size"].rename("count").sort_values(ascending=False)
     print(f"✅ {cat2_var} counts:\n{cat1_counts}\n")
 
     # Count occurrences of each gender within each age group
-    cat1_cat2_counts = df.groupby([cat1_var, cat2_var]).size().unstack()
+    cat1_cat2_counts = cube[(cat1_var, cat2_var)]["size"].unstack()
     print(f"✅ {cat1_var} x {cat2_var} counts:\n{cat1_cat2_counts}\n")
 
     # Convert to dictionary
@@ -137,47 +810,118 @@ def count_combinations(df, cat1_var, cat2_var, dataset_name):
 
     return result
 
+# matplotlib backends that only write files; plt.show() has nothing to display on them
+NON_INTERACTIVE_BACKENDS = ("agg", "cairo", "pdf", "pgf", "ps", "svg", "template")
+
+#this function switches matplotlib to headless rendering for batch runs
+def use_batch_rendering():
+    """
+    Forces the non-interactive Agg backend so figures are only written to files:
+    no GUI event loop is started and plt.show() never blocks. Also applies to
+    child processes started afterwards.
+    """
+    import matplotlib
+
+    os.environ["MPLBACKEND"] = "Agg"
+    matplotlib.use("Agg", force=True)
+
+#this function saves a finished figure, shows it on interactive backends and releases it
+def finish_figure(fig, file_name):
+    """
+    Saves a figure, shows it when a GUI backend is active and always closes it, so
+    at most one figure per plot helper is alive at any time.
+
+    Parameters:
+    - fig (Figure): The finished figure.
+    - file_name (str): Path of the PNG (e.g., "plot/original_interaction_age_gender.png").
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    try:
+        fig.savefig(file_name)
+        print(f"\n✅ Plot saved as '{file_name}'")
+        if matplotlib.get_backend().lower() not in NON_INTERACTIVE_BACKENDS:
+            plt.show()
+    finally:
+        plt.close(fig)
+
+#this function draws the interaction plot from cell means and confidence intervals
+def draw_interaction_effect(summary, cat1_var, cat2_var, target_var, dataset_name, order, hue_order):
+    """
+    Draws the precomputed cell means with seaborn's pointplot and their confidence
+    intervals with matplotlib error bars, so no resampling happens while plotting.
+
+    Parameters:
+    - summary (DataFrame): Indexed by (cat1_var, cat2_var) with estimate, ci_low and ci_high.
+    - cat1_var (str): Variable on the x axis.
+    - cat2_var (str): Variable drawn as separate lines.
+    - target_var (str): The dependent variable (e.g., "Acceptance_Score").
+    - dataset_name (str): Name of the dataset for the title.
+    - order (list): cat1_var levels from left to right.
+    - hue_order (list): cat2_var levels, one line each.
+
+    Returns:
+    - Figure: The interaction plot.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # pointplot needs one marker and line style per hue level, so the three styles repeat
+    markers = [["o", "s", "d"][i % 3] for i in range(len(hue_order))]
+    linestyles = [["-", "--", ":"][i % 3] for i in range(len(hue_order))]
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.pointplot(
+        data=summary.reset_index(), x=cat1_var, y="estimate", hue=cat2_var, order=order, hue_order=hue_order,
+        errorbar=None, dodge=True, markers=markers, linestyles=linestyles, ax=ax
+    )
+    # one line per hue level; its (dodged) x positions place the error bars
+    for line, level in zip(ax.lines, hue_order):
+        x, y = line.get_xdata(), line.get_ydata()
+        cells = summary.reindex([(order[int(round(position))], level) for position in x])
+        ax.errorbar(x, y, yerr=[y - cells["ci_low"].to_numpy(), cells["ci_high"].to_numpy() - y],
+                    fmt="none", ecolor=line.get_color(), capsize=5)
+
+    ax.set_title(f"Interaction Effect: {cat1_var} & {cat2_var} on {target_var} ({dataset_name})")
+    ax.set_xlabel(cat1_var)
+    ax.set_ylabel(target_var)
+    ax.legend(title=cat2_var)
+    ax.grid(True)
+    return fig
+
 #this function plot the point graph with error bars
 def plot_interaction_effect(df, cat1_var, cat2_var, target_var, dataset_name, plot_name):
     """
     Creates an interaction plot for cat1_var and cat2_var on Acceptance Score.
-    Handles missing values (NaN) to avoid KeyErrors in Seaborn's pointplot.
+    Handles missing values (NaN) so every category gets its own point.
     """
+    from bootstrap import bootstrap_group_ci
+    from plotting import submit_plot
+
     # print(f"\n🔍 Unique values in '{cat1_var}' ({dataset_name}): {df[cat1_var].unique()}")
     # print(f"🔍 Unique values in '{cat2_var}' ({dataset_name}): {df[cat2_var].unique()}")
 
-    # Step 1: Remove spaces and convert to string (ensures category consistency)
-    df[cat1_var] = df[cat1_var].astype(str).str.strip()
-    df[cat2_var] = df[cat2_var].astype(str).str.strip()
+    # Step 1: Give missing categories (NaN) a level of their own, "Unknown"; labels are
+    # already stripped and categorical (see normalize_frame)
+    df = df.copy()
+    for var in (cat1_var, cat2_var):
+        if df[var].isna().any():
+            df[var] = pd.Categorical(df[var]).add_categories("Unknown").fillna("Unknown")
 
-    # Step 2: Fill missing values (NaN) with "Unknown" to avoid KeyErrors
-    df[cat2_var] = df[cat2_var].fillna("Unknown")
-    df[cat1_var] = df[cat1_var].fillna("Unknown")
-
-    # Step 3: Drop rows where the target variable is NaN (ensures valid plotting)
+    # Step 2: Drop rows where the target variable is NaN (ensures valid plotting)
     df = df.dropna(subset=[target_var])
 
-    # Step 4: Plot
-    plt.figure(figsize=(8, 6))
-    try:
-        sns.pointplot(
-            x=cat1_var, y=target_var, hue=cat2_var, data=df,
-            capsize=0.1, dodge=True, markers=["o", "s", "d"], linestyles=["-", "--", ":"]
-        )
-        plt.title(f"Interaction Effect: {cat1_var} & {cat2_var} on {target_var} ({dataset_name})")
-        plt.xlabel(cat1_var)
-        plt.ylabel(target_var)
-        plt.legend(title=cat2_var)
-        plt.grid(True)
-        plt.savefig(f"plot/{plot_name}.png")
-        print(f"\n✅ Plot saved as 'plot/{plot_name}.png'")
-
-    except KeyError as e:
-        print(f"\n❌ KeyError: {e}")
-        print("🔹 Possible causes: Category missing or incorrectly formatted.")
+    # Step 3: Cell means with a 95% percentile bootstrap CI (1000 resamples, as seaborn's
+    # pointplot draws), seeded so the same data always gives the same PNG
+    summary = bootstrap_group_ci(df, [cat1_var, cat2_var], target_var, method="percentile", n_resamples=1000, seed=0)
+
+    # Step 4: Plot, levels in their declared order
+    submit_plot(draw_interaction_effect, f"plot/{plot_name}.png", summary, cat1_var, cat2_var, target_var, dataset_name,
+                category_levels(df[cat1_var]), category_levels(df[cat2_var]))
 
 #this function calculate the mean, median, std for categorial variables and their interaction(all possibility)
-def compute_summary_stats_all_possibility(df, categorical_vars, target_variable):
+def compute_summary_stats_all_possibility(df, categorical_vars, target_variable, cube=None):
     """
     Computes mean, median, and standard deviation for each categorical variable and their interaction.
 
@@ -185,37 +929,30 @@ def compute_summary_stats_all_possibility(df, categorical_vars, target_variable)
     - df (DataFrame): Dataset (original or perceived).
     - categorical_vars (list): List of categorical variables (e.g., ["Gender", "age group"]).
     - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+    - cube (dict): summary_cube of df; computed here if not given.
 
     Returns:
     - DataFrame: Summary statistics for each categorical variable and their interaction.
     """
+    if cube is None:
+        cube = summary_cube(df, categorical_vars, target_variable)
     summary_stats = {}
 
     # Compute stats for each categorical variable
     for var in categorical_vars:
-        summary_stats[var] = df.groupby(var)[target_variable].agg(
-            mean="mean",
-            median="median",
-            std="std",
-            count="count"
-        ).reset_index()
-    
-    # Compute interaction effect
-    interaction_var = f"{categorical_vars[0]} x {categorical_vars[1]}"
-    df[interaction_var] = df[categorical_vars[0]].astype(str) + " & " + df[categorical_vars[1]].astype(str)
+        summary_stats[var] = cube[(var,)][["mean", "median", "std", "count"]].reset_index()
 
-    summary_stats[interaction_var] = df.groupby(interaction_var)[target_variable].agg(
-        mean="mean",
-        median="median",
-        std="std",
-        count="count"
-    ).reset_index()
+    # Interaction effect, labelled "A & B"
+    interaction_var = f"{categorical_vars[0]} x {categorical_vars[1]}"
+    interaction_stats = cube[tuple(categorical_vars[:2])][["mean", "median", "std", "count"]]
+    interaction_stats.index = pd.Index([" & ".join(map(str, cell)) for cell in interaction_stats.index], name=interaction_var)
+    summary_stats[interaction_var] = interaction_stats.reset_index()
 
     return summary_stats
 
 
 #this function calculate the mean, median, std for categorial variables and their interaction(singled value)
-def compute_summary_stats(df, categorical_vars, target_variable):
+def compute_summary_stats(df, categorical_vars, target_variable, cube=None):
     """
     Computes mean, median, and standard deviation for each categorical variable 
     and a single value for their interaction.
@@ -224,34 +961,28 @@ def compute_summary_stats(df, categorical_vars, target_variable):
     - df (DataFrame): Dataset (original or perceived).
     - categorical_vars (list): List of categorical variables (e.g., ["Gender", "age group"]).
     - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+    - cube (dict): summary_cube of df; computed here if not given.
 
     Returns:
     - dict: Summary statistics containing mean, median, and std for each category 
             and a single value for interaction.
     """
+    if cube is None:
+        cube = summary_cube(df, categorical_vars, target_variable)
     summary_stats = {}
 
     # Compute stats for each categorical variable
     for var in categorical_vars:
-        summary_stats[var] = df.groupby(var)[target_variable].agg(["mean", "median", "std"])
+        summary_stats[var] = cube[(var,)][["mean", "median", "std"]]
 
     # Compute a single value for the interaction effect
-    interaction_grouped = df.groupby(categorical_vars)[target_variable].mean()  # Grouped means
-    interaction_mean = interaction_grouped.mean()   # Mean of grouped means
-    interaction_median = np.median(interaction_grouped)  # Median of grouped means
-    interaction_std = interaction_grouped.std()    # Standard deviation of grouped means
-
-    summary_stats["Interaction"] = {
-        "Mean": interaction_mean,
-        "Median": interaction_median,
-        "Std": interaction_std
-    }
+    summary_stats.update(compute_interaction_stats_only(df, categorical_vars, target_variable, cube=cube))
 
     return summary_stats
 
 
 #this function calculate the mean, median, std for categorial variables interaction(singled value)
-def compute_interaction_stats_only(df, categorical_vars, target_variable):
+def compute_interaction_stats_only(df, categorical_vars, target_variable, cube=None):
     """
     Computes mean, median, and standard deviation for categorial variables interaction (single values).
 
@@ -259,15 +990,18 @@ def compute_interaction_stats_only(df, categorical_vars, target_variable):
     - df (DataFrame): Dataset (original or perceived).
     - categorical_vars (list): List of categorical variables (e.g., ["Gender", "age group"]).
     - target_variable (str): The dependent variable (e.g., "Acceptance_Score").
+    - cube (dict): summary_cube of df; computed here if not given.
 
     Returns:
     - dict: Summary statistics containing mean, median, and std for each category 
             and a single value for interaction.
     """
+    if cube is None:
+        cube = summary_cube(df, categorical_vars, target_variable)
     summary_stats = {}
 
     # Compute a single value for the interaction effect
-    interaction_grouped = df.groupby(categorical_vars)[target_variable].mean()  # Grouped means
+    interaction_grouped = cube[tuple(categorical_vars)]["mean"]  # Grouped means
     interaction_mean = interaction_grouped.mean()   # Mean of grouped means
     interaction_median = np.median(interaction_grouped)  # Median of grouped means
     interaction_std = interaction_grouped.std()    # Standard deviation of grouped means